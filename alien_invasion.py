@@ -1,40 +1,103 @@
 # The only file to run to play Alien Invasion.
 
+import argparse
+import random
 import sys
-from time import sleep
+import threading
+import time
 
+import numpy as np
 import pygame
 
 from settings import Settings
+from assets import Assets
+from text_cache import TextCache
+from sound import SoundBank
+from scores import ScoreStore, print_top_scores
 from game_stats import GameStats
+from game_state import GameState
 from scoreboard import Scoreboard
 from button import Button
+from renderer import DirtyRenderer
 from ship import Ship
-from bullet import Bullet
-from alien import Alien
+from bullet import BulletPool
+from fleet import Fleet
+from formation import grid_formation
+from waves import load_waves
+from replay import Recorder
+from profiler import FrameProfiler, StartupTimer
+from simulation import SimulationThread, take_world
+from autoplay import AutoPlayer
+from controls import InputHandler, LEFT, RIGHT, FIRE, START, WAKE_UP
+import savegame
 
 class AlienInvasion:
     """Overall class to manage game assets and behavior."""
 
-    def __init__(self):
-        """Initialise the game, and create game resources."""
-        # Initialise the background settings for Pygame to work properly.
-        pygame.init()
+    def __init__(self, settings=None):
+        """Initialise the game, and create game resources.
+            Pass in settings to change them before the game is set up.
+        """
+        # Time each step of starting up, until the first frame is drawn.
+        self.startup = StartupTimer()
 
         # Create an instance of Settings so that we can use it to access settings later
-        self.settings = Settings()
+        if settings is None:
+            settings = Settings()
+        self.settings = settings
+
+        if self.settings.headless:
+            # Without a window, only fonts are needed, 
+            #  and the game is drawn on a surface that is never shown.
+            pygame.font.init()
+            self.screen = pygame.Surface(
+                (self.settings.screen_width, self.settings.screen_height))
+        else:
+            # Initialise only the parts of Pygame needed to show the menu.
+            #  Sound is started when the first game starts.
+            pygame.display.init()
+            pygame.font.init()
+
+            #  Assign the main display surface to 'screen'.
+            # Allow running the game in fullscreen mode
+            if self.settings.fullscreen:
+                self.screen = pygame.display.set_mode((0,0), pygame.FULLSCREEN)
+            else:
+                self.screen = pygame.display.set_mode(
+                    (self.settings.screen_width, self.settings.screen_height))
+            pygame.display.set_caption("Alien Invasion")
 
-        #  Assign the main display surface to 'screen'.
-        # Allow running the game in fullscreen mode
-        self.screen = pygame.display.set_mode((0,0), pygame.FULLSCREEN)
         self.settings.screen_width = self.screen.get_rect().width
         self.settings.screen_height = self.screen.get_rect().height
+        self.startup.mark("display")
+
+        # Seed the random number generator, so a game can be played again exactly.
+        if self.settings.seed is None:
+            self.settings.seed = random.randrange(2**32)
+        random.seed(self.settings.seed)
+
+        # Count the ticks the game has run for.
+        self.ticks = 0
+
+        # Create an instance to load every image once and share it.
+        self.assets = Assets()
 
-        pygame.display.set_caption("Alien Invasion")
+        # Create an instance to render each piece of text only once.
+        self.text_cache = TextCache(self.settings.text_cache_size)
+
+        # Create an instance to decode every sound once and play it by name.
+        self.sounds = SoundBank(self)
+
+        # Create an instance to save high scores and past games.
+        self.scores = ScoreStore(self)
+        self.startup.mark("sound, scores")
 
         # Create an instance to store game statistics.
         self.stats = GameStats(self)
 
+        # Create an instance to track pauses between lives and levels.
+        self.state = GameState(self)
+
         # Create an instance for the Scoreboard.
         self.sb = Scoreboard(self)
 
@@ -42,12 +105,24 @@ class AlienInvasion:
         # Note Ship() requires one argument, an instance of AlienInvasion
         self.ship = Ship(self)
 
-        # Create an attribute bulletS to represent a whole group of bullets.
-        self.bullets = pygame.sprite.Group()
+        # Create an attribute bulletS to represent a whole pool of bullets.
+        self.bullets = BulletPool(self)
 
-        # Create an attribute alienS to represent a whole group of aliens.
-        self.aliens = pygame.sprite.Group()
-        self._create_fleet()
+        # Create an attribute alienS to represent the whole fleet of aliens.
+        #  The fleet itself is only made when a game starts.
+        self.aliens = Fleet(self)
+
+        # Load the waves of aliens for each level, if there is a wave file.
+        self.waves = None
+        if self.settings.wave_file:
+            self.waves = load_waves(self.settings.wave_file,
+                                    self.settings.wave_cache_file)
+
+        # Record every input if a recording file is set.
+        #  The recording names the wave file, so it is made after the waves.
+        self.recorder = None
+        if self.settings.record_file:
+            self.recorder = Recorder(self, self.settings.record_file)
 
         # Make the Play button.
         self.play_button = Button(self, "Play")
@@ -55,77 +130,294 @@ class AlienInvasion:
         # Save background colour as an attribute
         self.bg_color = self.settings.bg_color
 
+        # Create an instance to draw only the parts of the screen that changed.
+        self.renderer = DirtyRenderer(self)
+
+        # Create an instance to time each frame, turned on with F3.
+        self.profiler = FrameProfiler(self)
+
+        # Create an instance to play the game by itself, turned on with A.
+        self.autoplay = AutoPlayer(self)
+
+        # Create an instance to turn keypresses into actions once per tick.
+        self.controls = InputHandler(self)
+
+        # Thread that updates the game world when Settings.threaded is on.
+        self.simulation = None
+        self.startup.mark("game objects")
+
+    def _first_frame_drawn(self):
+        """Finish timing the startup, and report it if Settings asks for it."""
+        self.startup.mark("first frame")
+        if self.settings.startup_report:
+            print(self.startup.report())
+
     def run_game(self):
-        """Start the main loop for the game."""
+        """Start the main loop for the game.
+            The game world moves forward in fixed ticks of 1/tick_rate seconds,
+             and frames are drawn separately, at most max_fps times a second.
+        """
+        if self.settings.threaded:
+            self._run_threaded()
+            return
+
+        clock = pygame.time.Clock()
+        tick_time = 1 / self.settings.tick_rate
+
+        # Time that has passed but has not been simulated yet.
+        accumulator = 0.0
+        first_frame = True
+
         while True:
+            # Wait to stay under the frame rate cap, then measure the frame time.
+            frame_time = clock.tick(self.settings.max_fps) / 1000
+            accumulator += min(frame_time, self.settings.max_frame_time)
+
             self._check_events()
-        
-            # If all ships have been used up, the game should freeze.
-            if self.stats.game_active:
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
-            
-            self._update_screen()
-
-    def _check_events(self):
-        """Respond to keypresses, key releases and mouse events."""
-        for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self._end_game()
-
-                # Detect when the arrow key is pressed.
-                elif event.type == pygame.KEYDOWN:
-                    self._check_keydown_events(event)
-
-                # Detect when the arrow key is released.
-                elif event.type == pygame.KEYUP:
-                    self._check_keyup_events(event)
-
-                # Detect when the mouse is clicked.
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    self._check_play_button(mouse_pos)
+
+            # Run as many ticks as fit in the time that has passed.
+            while accumulator >= tick_time:
+                self.controls.apply()
+                self._tick(tick_time)
+                accumulator -= tick_time
+
+            # Draw the frame part of the way towards the next tick.
+            self._update_screen(accumulator / tick_time)
+            self.controls.frame_shown()
+            if first_frame:
+                self._first_frame_drawn()
+                first_frame = False
+
+            if self.profiler.enabled:
+                self.profiler.end_frame()
+
+            if not self.stats.game_active:
+                self._wait_while_idle(clock)
+                accumulator = 0.0
+
+    def _wait_while_idle(self, clock):
+        """Sleep until an event comes in, as nothing moves while no game 
+            is going. The time spent waiting is left out of clock.
+        """
+        self._check_events(wait=self.settings.idle_wait_timeout)
+        clock.tick()
+
+    def _run_threaded(self):
+        """Run the game world on its own thread, and draw it on this one.
+            Each frame draws the latest world the simulation thread published,
+             so a slow frame doesn't hold up the ticks.
+        """
+        self.simulation = SimulationThread(self)
+        self.simulation.start()
+
+        clock = pygame.time.Clock()
+        tick_time = 1 / self.settings.tick_rate
+        mouse_visible = None
+        first_frame = True
+
+        while True:
+            clock.tick(self.settings.max_fps)
+            self._check_events()
+            world = self.simulation.world
+
+            # Only the main thread can show or hide the mouse cursor.
+            if mouse_visible != (not world.game_active):
+                mouse_visible = not world.game_active
+                pygame.mouse.set_visible(mouse_visible)
+
+            # Draw the world part of the way towards the next tick.
+            alpha = min((time.perf_counter() - world.published) / tick_time, 1.0)
+            self._update_screen(alpha, world)
+            self.controls.frame_shown()
+            if first_frame:
+                self._first_frame_drawn()
+                first_frame = False
+
+            if self.profiler.enabled:
+                self.profiler.end_frame()
+
+            if not world.game_active:
+                self._wait_while_idle(clock)
+
+    def step(self, actions=()):
+        """Move the game forward by one tick, without drawing anything.
+            actions is a collection of the actions to take this tick:
+             "left" and "right" hold the arrow keys down for the tick,
+             "fire" fires a bullet, and "start" starts a new game.
+            Return the state of the game, as returned by get_state().
+            The actions are turned into the same key events as the keyboard
+             sends, so a game played with step() can be recorded and replayed.
+        """
+        keys = []
+        if "start" in actions and not self.stats.game_active:
+            keys.append((pygame.KEYDOWN, pygame.K_p))
+        # Press or let go of an arrow key when its action starts or stops.
+        for action, key, bit in (("left", pygame.K_LEFT, LEFT),
+                                 ("right", pygame.K_RIGHT, RIGHT)):
+            held = bool(self.controls.held & bit)
+            if (action in actions) != held:
+                keys.append((pygame.KEYUP if held else pygame.KEYDOWN, key))
+        if "fire" in actions:
+            keys.append((pygame.KEYDOWN, pygame.K_SPACE))
+        for kind, key in keys:
+            self._handle_event(pygame.event.Event(kind, key=key))
+
+        self.controls.apply()
+        self._tick(1 / self.settings.tick_rate)
+
+        return self.get_state()
+
+    def get_state(self):
+        """Return a dictionary describing the state of the game."""
+        alive = self.aliens.alive
+        return {
+            "score": self.stats.score,
+            "level": self.stats.level,
+            "ships_left": self.stats.ships_left,
+            "game_active": self.stats.game_active,
+            "state": self.state.name,
+            "tick": self.ticks,
+            "ship_x": self.ship.rect.x,
+            # One (x, y) row for each alien and bullet on the screen.
+            "aliens": np.column_stack(
+                (self.aliens.lefts()[alive], self.aliens.tops()[alive])),
+            "bullets": np.column_stack(
+                (self.bullets.x[self.bullets.alive],
+                 self.bullets.y[self.bullets.alive].astype(int))),
+        }
+
+    def _tick(self, dt):
+        """Run one tick of dt seconds, and count it."""
+        # If all ships have been used up, the game should freeze.
+        if self.stats.game_active:
+            self._update_game(dt)
+        self.ticks += 1
+
+    def _update_game(self, dt):
+        """Move the game world forward by one tick of dt seconds."""
+        # Wait out a pause without freezing the window.
+        if not self.state.is_playing():
+            self.state.update(dt)
+            return
+
+        # Let the autoplayer choose its moves for this tick.
+        if self.autoplay.enabled:
+            self.autoplay.update()
+
+        self.ship.update(dt)
+        self._update_bullets(dt)
+        self._update_aliens(dt)
+
+    def _check_events(self, wait=None):
+        """Respond to keypresses, key releases and mouse events.
+            If wait is a number of seconds, wait up to that long for an event.
+            When the game world runs on its own thread, only quitting and
+             redrawing are handled here. Other events are handed to that thread.
+        """
+        for event in self.controls.get_events(wait):
+            if self.simulation and not self._is_main_thread_event(event):
+                self.simulation.events.put(event)
+            else:
+                self._handle_event(event)
+
+    def _is_main_thread_event(self, event):
+        """Return True if event has to be handled on the main thread.
+            A cProfile capture is started there, so it includes the drawing.
+        """
+        return (event.type in (pygame.QUIT, pygame.VIDEOEXPOSE, WAKE_UP)
+                or (event.type == pygame.KEYDOWN
+                    and event.key in (pygame.K_q, pygame.K_F2)))
+
+    def _handle_event(self, event):
+        """Respond to a single keypress, key release or mouse event."""
+        if event.type == pygame.QUIT:
+            self._end_game()
+
+        # Detect when the arrow key is pressed.
+        elif event.type == pygame.KEYDOWN:
+            if self.recorder:
+                self.recorder.record_event(event)
+            self._check_keydown_events(event)
+
+        # Detect when the arrow key is released.
+        elif event.type == pygame.KEYUP:
+            if self.recorder:
+                self.recorder.record_event(event)
+            self._check_keyup_events(event)
+
+        # Draw the whole screen again when the window needs it.
+        elif event.type == pygame.VIDEOEXPOSE:
+            self.renderer.invalidate()
+
+        # Detect when the mouse is clicked.
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self._check_play_button(event.pos)
 
     def _check_keydown_events(self, event):
-        """Respond to keypresses."""
+        """Respond to keypresses.
+            Moving, firing and starting a game happen at the next tick.
+        """
         if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = True 
+            self.controls.press(RIGHT)
         elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
+            self.controls.press(LEFT)
         elif event.key == pygame.K_q:
             self._end_game()
         elif event.key == pygame.K_p:
-            self._start_game()
+            self.controls.press(START)
         elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
+            self.controls.press(FIRE)
+        elif event.key == pygame.K_a:
+            self.autoplay.toggle()
+        elif event.key == pygame.K_F3:
+            self.profiler.toggle()
+        elif event.key == pygame.K_F2:
+            self.profiler.toggle_capture()
+        # Saving and loading are turned off while recording, as a recording
+        #  can only be replayed from the start of the game.
+        elif event.key == pygame.K_F5 and not self.recorder:
+            savegame.save_to_file(self, self.settings.save_file)
+        elif event.key == pygame.K_F9 and not self.recorder:
+            self._load_game()
 
     def _check_keyup_events(self, event):
         """Respond to key releases."""
         if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = False
+            self.controls.release(RIGHT)
         elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = False
+            self.controls.release(LEFT)
 
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks on the Play button."""
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
         # Deactivate the play button when the game is going. 
         if button_clicked and not self.stats.game_active:
+            if self.recorder:
+                self.recorder.record_start()
             self._start_game()
     
-    def _start_game(self):
-        """Start a new game."""
+    def _start_game(self, level=None):
+        """Start a new game, on level or on Settings.start_level."""
+        if level is None:
+            level = self.settings.start_level
+
         # Reset the game speed.
-        self.settings.starting_speed()
+        self.settings.starting_speed(level)
+        self._apply_wave_speed(level)
 
         # Reset the game statistics. 
         self.stats.reset_stats()
+        self.stats.level = level
         self.stats.game_active = True
+        self.game_start_tick = self.ticks
+        self.state.change(GameState.PLAYING)
         self.sb.prep_images()
 
         # Hide the mouse cursor when the game is going.
-        pygame.mouse.set_visible(False)
+        self._set_mouse_visible(False)
+
+        # Start the sound now it is needed.
+        self.sounds.load()
 
         # Get rid of any remaining aliens and bullets.
         self.aliens.empty()
@@ -135,27 +427,44 @@ class AlienInvasion:
         self._create_fleet()
         self.ship.center_ship()
 
+    def _load_game(self):
+        """Load the saved game, if there is one, and carry on playing it."""
+        try:
+            savegame.load_from_file(self, self.settings.save_file)
+        except (OSError, ValueError):
+            return
+        self._set_mouse_visible(not self.stats.game_active)
+        self.sounds.load()
+
+    def _set_mouse_visible(self, visible):
+        """Show or hide the mouse cursor, if there is a window.
+            On the simulation thread this is left to the main loop.
+        """
+        if (not self.settings.headless
+                and threading.current_thread() is threading.main_thread()):
+            pygame.mouse.set_visible(visible)
+
     def _end_game(self):
-        with open('high_score.txt', 'w') as f:
-            f.write(str(self.stats.high_score))
+        # Stop the simulation thread, so nothing changes while saving.
+        if self.simulation:
+            self.simulation.stop()
+        if self.recorder:
+            self.recorder.close()
+        # Make sure the scores are saved before quitting.
+        self.scores.save_high_score(self.stats.high_score)
+        self.scores.close()
         sys.exit()
     
     def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullets_allowed and self.stats.game_active:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
-            self._play_sound(1, "sounds/laser.mp3")
+        """Fire a new bullet from the bullet pool."""
+        if self.state.is_playing() and self.bullets.fire():
+            self.sounds.play("laser")
 
-    def _update_bullets(self):
+    def _update_bullets(self, dt):
         """Update position of bullets and get rid of old bullets."""
-        # Update bullet positions.
-        self.bullets.update()
-
-        # Get rid of bullets that have gone pass the top of the screen.
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
+        # Update bullet positions, 
+        #  and get rid of bullets that have gone pass the top of the screen.
+        self.bullets.update(dt)
         
         self._check_bullet_alien_collisions()
         
@@ -163,14 +472,15 @@ class AlienInvasion:
         """Respond when a bullet hits an alien."""
         # Check for any bullets that have hit aliens.
         #  If so, get rid of the bullet and the alien.
-        collisions = pygame.sprite.groupcollide(
-            self.bullets, self.aliens, True, True)
+        collisions = self.aliens.collide_bullets(self.bullets)
         
         # When there is a collision, a dictionary is created.
         if collisions:
-            # Key: A single bullet. Value: List of aliens hit by the bullet.
+            # Key: A single bullet. Value: List of aliens destroyed by the bullet.
+            self.bullets.kill(list(collisions))
             for aliens_list in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens_list)
+                self.stats.score += (self.settings.alien_points
+                                     * int(self.aliens.points[aliens_list].sum()))
             self.sb.prep_score()
             self.sb.check_high_score()
     
@@ -184,78 +494,58 @@ class AlienInvasion:
             Increase speed of the new fleet and increase the value of the level.
         """
         self.bullets.empty()
-        self._create_fleet()
-        self.settings.increase_speed()
         self.stats.level += 1
+        self.settings.set_level(self.stats.level)
+        self._apply_wave_speed(self.stats.level)
+        self._create_fleet()
         self.sb.prep_level()
-        self._play_sound(2, "sounds/level_up.mp3")
+        self.sounds.play("level_up")
         # Pause to allow user to regroup.
-        sleep(self.settings.pause_time_level_up)
+        self.state.change(GameState.LEVEL_TRANSITION,
+                          self.settings.pause_time_level_up)
         
-    def _update_aliens(self):
+    def _update_aliens(self, dt):
         """Check if the fleet is at the edge of the screen,
             then update the positions of aliens in the fleet.
              Also check if any alien has hit the ship,
               or hit the bottom of the screen.
         """
         self._check_fleet_edges()
-        self.aliens.update()
+        self.aliens.update(dt)
 
         # Look for when an alien collides with the ship.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
+        if self.aliens.collide_rect(self.ship.rect):
             self._ship_hit()
         
         # Look for aliens hitting the bottom of the screen.
         self._check_aliens_bottom()
 
+    def _apply_wave_speed(self, level):
+        """Scale the alien speed by the speed scale of level's wave, if any."""
+        if self.waves:
+            self.settings.alien_speed *= self.waves.level(level).alien_speed_scale
+
     def _create_fleet(self):
-        """Create a fleet of aliens."""
-        # Find the number of aliens in a row.
-        # Make one alien to help us make the calculation. It won't be part of the fleet.
-        # Spacing between each alien is equal to one alien width.
-        # Keep width of one alien to the left of the first alien. 
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        available_space_x = self.settings.screen_width - alien_width
-        number_aliens_x = available_space_x // (2 * alien_width)
-
-        # Determine the number of rows of aliens that fit on the screen.
-        #  Leave two alien height from the top, three alien heights from the rocket, 
-        #   and the ship height from the bottom of the screen.
-        #  Keep gap of one alien height between each row.
-        ship_height = self.ship.rect.height
-        available_space_y = (self.settings.screen_height - (5 * alien_height) 
-                             - ship_height)
-        number_rows = available_space_y // (2 * alien_height)
-
-        # Create the full fleet of aliens.
-        #  Outer loop: Count the number of rows of aliens we want.
-        for row_number in range(number_rows):
-            # Inner loop: Create one row of aliens.
-            for alien_number in range(number_aliens_x):
-                self._create_alien(alien_number, row_number)
-
-    def _create_alien(self, alien_number, row_number):
-        """Create an alien and place it in the row."""
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        alien.x = alien_width + (2 * alien_width * alien_number)
-        alien.rect.x = alien.x
-        alien.y = (2 * alien_height) + (2 * alien_height * row_number)
-        alien.rect.y = alien.y
-        self.aliens.add(alien)
+        """Create a fleet of aliens, laid out by the wave of the current level
+            if there is a wave file.
+            The layout is only worked out once for each level and screen size.
+        """
+        sizes = (self.settings.screen_width, self.settings.screen_height,
+                 self.aliens.width, self.aliens.height, self.ship.rect.height)
+        if self.waves:
+            formation = self.waves.formation(self.stats.level, *sizes)
+        else:
+            formation = grid_formation(*sizes)
+        self.aliens.spawn(formation)
 
     def _check_fleet_edges(self):
         """Respond appropriately if any aliens have reached the edge of the screen."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
+        if self.aliens.check_edges():
+            self._change_fleet_direction()
     
     def _change_fleet_direction(self):
         """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
+        self.aliens.drop(self.settings.fleet_drop_speed)
         self.settings.fleet_direction *= -1
 
     def _ship_hit(self):
@@ -274,58 +564,120 @@ class AlienInvasion:
             self.ship.center_ship()
 
             # Play sound.
-            self._play_sound(3, "sounds/ship_lost.mp3")
+            self.sounds.play("ship_lost")
 
             # Pause to allow user to regroup.
-            sleep(self.settings.pause_time_ship_lost)
+            self.state.change(GameState.RESPAWN,
+                              self.settings.pause_time_ship_lost)
 
         # When player runs out of ship, the game ends.
         else:
             self.stats.game_active = False
-            self._play_sound(4, "sounds/game_over.mp3")
+            self.state.change(GameState.GAME_OVER)
+            self.scores.record_game(
+                self.stats.score, self.stats.level,
+                (self.ticks - self.game_start_tick) / self.settings.tick_rate)
+            self.sounds.play("game_over")
             # Make the cursor reappear.
-            pygame.mouse.set_visible(True)
+            self._set_mouse_visible(True)
 
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
         screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as if the ship got hit.
-                self._ship_hit()
-                break
-
-    def _play_sound(self, channel_number, sound_filepath):
-        pygame.mixer.init()
-        sound = pygame.mixer.Sound(sound_filepath)
-        pygame.mixer.Channel(channel_number).play(sound)        
-
-    def _update_screen(self): 
-        """Update images on the screen, and flip to the new screen."""
+        if self.aliens.reached_bottom(screen_rect.bottom):
+            # Treat this the same as if the ship got hit.
+            self._ship_hit()
+
+    def _update_screen(self, alpha=1.0, world=None): 
+        """Update images on the screen, and flip to the new screen.
+            alpha is how far the frame is between the previous tick and the next.
+             world is the World to draw, or None to draw the game as it is now.
+        """
+        if world is None:
+            world = take_world(self, frozen=False)
+
+        if self.settings.render_mode == "dirty":
+            # Only update the parts of the screen that changed.
+            self.renderer.render(lambda: self._draw_frame(alpha, world),
+                                 idle=not world.game_active)
+            return
+
         # Fill the screen with background color during each pass through the loop.
         self.screen.fill(self.bg_color)
 
+        self._draw_frame(alpha, world)
+
+        # Make the most recently drawn screen visible.
+        # Continually update the display to show the new positions of game elements. 
+        pygame.display.flip()
+
+    def _draw_frame(self, alpha, world):
+        """Draw every game element in world, and return the rects that were 
+            drawn on.
+        """
+        rects = []
+
         # Draw the ship on the screen, so the ship appears on top of the background.
-        self.ship.blitme()   
+        rects.append(world.ship.blitme(alpha))
 
         # Draw all fired bullets to the screen.
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
+        rects.extend(world.bullets.draw(alpha))
         
-        self.aliens.draw(self.screen)
+        rects.extend(world.aliens.draw(alpha))
 
         # Draw the score information
-        self.sb.draw_score()
+        rects.extend(self.sb.draw_score())
+
+        # Count down the pause between lives and levels.
+        if world.paused:
+            rects.append(self.sb.draw_countdown(world.time_left))
 
         # Draw the play button if the game is inactive.
-        if not self.stats.game_active:
-            self.play_button.draw_button()
+        if not world.game_active:
+            rects.append(self.play_button.draw_button())
 
-        # Make the most recently drawn screen visible.
-        # Continually update the display to show the new positions of game elements. 
-        pygame.display.flip()
+        # Draw the profiler overlay if it is on.
+        if self.profiler.enabled:
+            rects.extend(self.profiler.draw_hud())
+
+        return rects
+
+def positive_int(text):
+    """Turn text into a whole number of at least 1, for argparse."""
+    number = int(text)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or more, not {number}")
+    return number
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record every input to FILE, to play back with replay.py")
+    parser.add_argument("--level", type=positive_int, default=1,
+                        help="level to start new games on")
+    parser.add_argument("--threaded", action="store_true",
+                        help="update the game world on its own thread")
+    parser.add_argument("--waves", metavar="FILE",
+                        help="lay out each level's aliens from the wave file FILE")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each step of starting up took")
+    parser.add_argument("--dirty", action="store_true",
+                        help="only update the parts of the screen that changed")
+    parser.add_argument("--scores", action="store_true",
+                        help="print the best games played so far, and quit")
+    args = parser.parse_args()
+
     # Make a game instance, and run the game.
-    ai = AlienInvasion()
+    settings = Settings()
+    if args.scores:
+        print_top_scores(settings.score_history_file)
+        sys.exit()
+    settings.record_file = args.record
+    settings.start_level = args.level
+    settings.threaded = args.threaded
+    settings.startup_report = args.startup_report
+    settings.wave_file = args.waves
+    if args.dirty:
+        settings.render_mode = "dirty"
+    ai = AlienInvasion(settings)
     ai.run_game()
\ No newline at end of file
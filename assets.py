@@ -0,0 +1,41 @@
+import pygame
+
+class Assets:
+    """A class to load the game's images and fonts once and share them."""
+
+    def __init__(self):
+        """Initialise an empty image and font cache."""
+        # Key: file path of the image. Value: the loaded surface.
+        self.images = {}
+
+        # Key: size of the font. Value: the loaded font.
+        self.fonts = {}
+
+    def image(self, filepath):
+        """Return the image stored at filepath, loading it from disk only once.
+            Every caller gets the same surface, so it must not be drawn on.
+        """
+        image = self.images.get(filepath)
+        if image is None:
+            image = pygame.image.load(filepath)
+
+            # Match the pixel format of the display so blits are faster.
+            #  This can only be done once the display mode has been set.
+            if pygame.display.get_surface() is not None:
+                if image.get_flags() & pygame.SRCALPHA:
+                    image = image.convert_alpha()
+                else:
+                    image = image.convert()
+
+            self.images[filepath] = image
+        return image
+
+    def font(self, size):
+        """Return pygame's default font at size, loading it only once.
+            The default font is built in, so no system fonts have to be looked up.
+        """
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
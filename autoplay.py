@@ -0,0 +1,120 @@
+import math
+
+import numpy as np
+
+class WorldView:
+    """A class to answer the questions a player asks about the game.
+        The fleet keeps count of the aliens alive in each column and row,
+         so no question has to look at every alien.
+    """
+
+    def __init__(self, ai_game):
+        """Initialise the view of ai_game."""
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen.get_rect()
+        self.ship = ai_game.ship
+        self.aliens = ai_game.aliens
+        self.bullets = ai_game.bullets
+
+    def _first_alien(self):
+        """Return the position of the first alien, which every column and row
+            is measured from.
+        """
+        aliens = self.aliens
+        return math.floor(aliens.x[0] + 0.5), math.floor(aliens.y[0] + 0.5)
+
+    def column_centers(self):
+        """Return the columns with aliens left, and the x of their centres."""
+        aliens = self.aliens
+        columns = np.flatnonzero(aliens.column_alive)
+        first_left = self._first_alien()[0]
+        return columns, first_left + aliens.column_lefts[columns] + aliens.width / 2
+
+    def nearest_column(self, x):
+        """Return the column with aliens left whose centre is closest to x,
+            and the x of its centre, or None if the fleet is gone.
+        """
+        columns, centers = self.column_centers()
+        if not len(columns):
+            return None
+        nearest = int(np.abs(centers - x).argmin())
+        return int(columns[nearest]), float(centers[nearest])
+
+    def lowest_row_bottom(self):
+        """Return the bottom edge of the lowest row with aliens left,
+            or None if the fleet is gone.
+        """
+        rows = np.flatnonzero(self.aliens.row_alive)
+        if not len(rows):
+            return None
+        first_top = self._first_alien()[1]
+        return first_top + int(self.aliens.row_tops[rows[-1]]) + self.aliens.height
+
+    def bullet_in_flight(self, column):
+        """Return True if a bullet on the screen is under or inside column."""
+        aliens, bullets = self.aliens, self.bullets
+        if not bullets.number_alive:
+            return False
+        left = self._first_alien()[0] + int(aliens.column_lefts[column])
+        lefts = bullets.x[bullets.alive]
+        return bool(((lefts < left + aliens.width)
+                     & (lefts + bullets.width > left)).any())
+
+
+class AutoPlayer:
+    """A class to play the game by itself, turned on and off with A.
+        Each tick it moves the ship under the column it aims for, allowing for
+         how far the fleet moves while a bullet flies up, and fires when lined up.
+    """
+
+    def __init__(self, ai_game):
+        """Initialise the player, turned off."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.ship = ai_game.ship
+        self.view = WorldView(ai_game)
+        self.enabled = False
+
+    def toggle(self):
+        """Turn the player on or off. When it is turned off, the ship stops."""
+        self.enabled = not self.enabled
+        if not self.enabled:
+            self.ship.moving_left = False
+            self.ship.moving_right = False
+
+    def actions(self):
+        """Return the actions to take this tick, as used by AlienInvasion.step()."""
+        view = self.view
+        ship_x = self.ship.rect.centerx
+        target = view.nearest_column(ship_x)
+        if target is None:
+            return set()
+        column, center = target
+
+        # Aim where the column will be when a bullet gets there.
+        flight_time = ((self.ship.rect.top - view.lowest_row_bottom())
+                       / self.settings.bullet_speed)
+        center += (self.settings.alien_speed * self.settings.fleet_direction
+                   * max(0.0, flight_time))
+
+        actions = set()
+        # Close enough that one tick of movement would overshoot.
+        tolerance = self.settings.ship_speed / self.settings.tick_rate
+        if center < ship_x - tolerance:
+            actions.add("left")
+        elif center > ship_x + tolerance:
+            actions.add("right")
+
+        # Fire when lined up, unless a bullet is already on its way up the column.
+        lined_up = abs(center - ship_x) <= self.ai_game.aliens.width / 2
+        if lined_up and not view.bullet_in_flight(column):
+            actions.add("fire")
+        return actions
+
+    def update(self):
+        """Move the ship and fire, for one tick."""
+        actions = self.actions()
+        self.ship.moving_left = "left" in actions
+        self.ship.moving_right = "right" in actions
+        if "fire" in actions:
+            self.ai_game._fire_bullet()
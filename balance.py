@@ -0,0 +1,178 @@
+# Simulate many headless games across a grid of Settings values,
+#  to see how each value changes the game.
+#  Usage: python balance.py --set speedup_scale=1.2,1.4,1.6 --set ship_limit=2,3 --games 500
+#  Every game is written to a JSON lines file as soon as it finishes,
+#   and a summary of each combination of values is printed at the end.
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import time
+
+from settings import Settings
+
+# Actions a player can choose from each tick.
+MOVES = [(), ("left",), ("right",)]
+
+
+# Each player is made fresh for every game, from the game and a random number
+#  generator, and returns a function that picks the actions for each tick.
+
+def random_player(ai_game, rng):
+    """Hold a random arrow key for a while, and fire now and then."""
+    move = None
+
+    def play(state):
+        nonlocal move
+        if move is None or ai_game.ticks % 30 == 0:
+            move = rng.choice(MOVES)
+        actions = set(move)
+        if rng.random() < 0.2:
+            actions.add("fire")
+        return actions
+    return play
+
+
+def scripted_player(ai_game, rng):
+    """Move under the lowest alien and keep firing."""
+    def play(state):
+        aliens = state["aliens"]
+        actions = {"fire"}
+        if len(aliens):
+            # Aim at the alien closest to the bottom of the screen.
+            target_left = aliens[aliens[:, 1].argmax(), 0]
+            target_x = target_left + ai_game.aliens.width / 2
+            if target_x < ai_game.ship.rect.centerx - 5:
+                actions.add("left")
+            elif target_x > ai_game.ship.rect.centerx + 5:
+                actions.add("right")
+        return actions
+    return play
+
+
+def autoplay_player(ai_game, rng):
+    """Play like the game's own autoplayer, aiming ahead of the fleet."""
+    return lambda state: ai_game.autoplay.actions()
+
+
+PLAYERS = {"random": random_player, "scripted": scripted_player,
+           "autoplay": autoplay_player}
+
+
+def play_game(job):
+    """Play one headless game and return its results.
+        job is (settings overrides, player name, seed, most ticks to play).
+    """
+    # Import here, so each worker process sets up pygame itself.
+    from alien_invasion import AlienInvasion
+
+    overrides, player_name, seed, max_ticks = job
+    settings = Settings()
+    settings.headless = True
+    settings.skip_pauses = True
+    settings.seed = seed
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    ai_game = AlienInvasion(settings)
+    player = PLAYERS[player_name](ai_game, random.Random(seed))
+
+    state = ai_game.step({"start"})
+    while state["game_active"] and ai_game.ticks < max_ticks:
+        state = ai_game.step(player(state))
+
+    return {
+        "settings": overrides,
+        "player": player_name,
+        "seed": seed,
+        "score": state["score"],
+        "level": state["level"],
+        "survival_time": ai_game.ticks / settings.tick_rate,
+        "finished": not state["game_active"],
+    }
+
+
+def parse_setting(text):
+    """Turn "name=value,value" into (name, [value, value])."""
+    name, _, values = text.partition("=")
+    if not hasattr(Settings(), name):
+        raise argparse.ArgumentTypeError(f"Settings has no attribute {name!r}.")
+    return name, [json.loads(value) for value in values.split(",")]
+
+
+def make_jobs(sweep, players, games, max_ticks):
+    """Make one job for every game of every combination of settings."""
+    names = [name for name, _ in sweep]
+    jobs = []
+    for values in itertools.product(*(values for _, values in sweep)):
+        overrides = dict(zip(names, values))
+        for player_name in players:
+            for seed in range(games):
+                jobs.append((overrides, player_name, seed, max_ticks))
+    return jobs
+
+
+def summarise(results):
+    """Group results by settings and player, and describe each group."""
+    groups = {}
+    for result in results:
+        key = (json.dumps(result["settings"], sort_keys=True), result["player"])
+        groups.setdefault(key, []).append(result)
+
+    summary = []
+    for (settings_text, player_name), group in sorted(groups.items()):
+        scores = sorted(result["score"] for result in group)
+        summary.append({
+            "settings": json.loads(settings_text),
+            "player": player_name,
+            "games": len(group),
+            "level_mean": statistics.fmean(result["level"] for result in group),
+            "level_max": max(result["level"] for result in group),
+            "survival_time_mean": statistics.fmean(
+                result["survival_time"] for result in group),
+            "score_p10": scores[len(scores) // 10],
+            "score_median": statistics.median(scores),
+            "score_p90": scores[len(scores) * 9 // 10],
+        })
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Simulate games to balance Settings.")
+    parser.add_argument("--set", dest="sweep", action="append", type=parse_setting,
+                        default=[], metavar="NAME=V1,V2",
+                        help="a setting and the values to try (can be repeated)")
+    parser.add_argument("--players", nargs="+", choices=list(PLAYERS),
+                        default=["scripted"], help="players to simulate")
+    parser.add_argument("--games", type=int, default=100,
+                        help="games for each combination of settings and player")
+    parser.add_argument("--max-time", type=float, default=600,
+                        help="longest game to simulate, in game seconds")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--output", default="balance_results.jsonl",
+                        help="file to stream every game's results to")
+    args = parser.parse_args()
+
+    max_ticks = int(args.max_time * Settings().tick_rate)
+    jobs = make_jobs(args.sweep, args.players, args.games, max_ticks)
+    processes = args.processes or os.cpu_count() or 1
+    print(f"Simulating {len(jobs):,} games on {processes} processes...")
+
+    start_time = time.perf_counter()
+    results = []
+    with multiprocessing.Pool(processes) as pool, open(args.output, "w") as f:
+        # Write every game as soon as it finishes, in whatever order that is.
+        chunksize = max(1, len(jobs) // (processes * 16))
+        for result in pool.imap_unordered(play_game, jobs, chunksize):
+            f.write(json.dumps(result) + "\n")
+            results.append(result)
+    elapsed = time.perf_counter() - start_time
+
+    for group in summarise(results):
+        print(json.dumps(group))
+    print(f"{len(results):,} games in {elapsed:.1f} s. Results written to {args.output}")
@@ -0,0 +1,255 @@
+# Benchmark the hot paths of the game loop.
+#  Every workload runs a scripted game in an off-screen window,
+#   and the results are written to a JSON file so runs can be compared.
+#  The time from starting a new process to the first frame is measured too.
+#  Usage: python benchmark.py [--frames N] [--output FILE] [--compare OLD_FILE]
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Draw to an off-screen window, and play no sound.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from settings import Settings
+from alien_invasion import AlienInvasion
+
+# Key: name of the workload.
+#  Value: screen size, how often to fire (in frames, 0 for never),
+#   and an extra step to time every frame.
+WORKLOADS = {
+    "fleet_1080p": {"size": (1920, 1080), "fire_every": 0, "extra": None},
+    "fleet_4k": {"size": (3840, 2160), "fire_every": 0, "extra": None},
+    "bullets_100": {"size": (1920, 1080), "fire_every": 1, "extra": None},
+    "level_ups": {"size": (1920, 1080), "fire_every": 0, "extra": "level_up"},
+    "create_fleet": {"size": (3840, 2160), "fire_every": 0, "extra": "create_fleet"},
+}
+
+# Run in a new process to time a cold start, up to the first frame drawn.
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+
+from settings import Settings
+from alien_invasion import AlienInvasion
+imports = time.perf_counter() - start
+
+settings = Settings()
+settings.fullscreen = False
+settings.save_scores = False
+ai_game = AlienInvasion(settings)
+ai_game._update_screen()
+ai_game._first_frame_drawn()
+
+steps = {"imports": imports, **ai_game.startup.steps}
+print(json.dumps(steps))
+"""
+
+
+def make_game(width, height):
+    """Make a game in a window of the given size, ready to play."""
+    settings = Settings()
+    settings.fullscreen = False
+    settings.screen_width = width
+    settings.screen_height = height
+    settings.sound_enabled = False
+    settings.save_scores = False
+    settings.skip_pauses = True
+    settings.max_fps = 0
+    settings.seed = 0
+
+    ai_game = AlienInvasion(settings)
+    ai_game._start_game()
+    return ai_game
+
+
+def run_frame(ai_game, frame_number, workload, timings):
+    """Run one tick and draw one frame, timing each part into timings."""
+    dt = 1 / ai_game.settings.tick_rate
+
+    # Sweep the ship back and forth, and fire if the workload asks for it.
+    ai_game.ship.moving_right = (frame_number // 200) % 2 == 0
+    ai_game.ship.moving_left = not ai_game.ship.moving_right
+    if workload["fire_every"] and frame_number % workload["fire_every"] == 0:
+        ai_game._fire_bullet()
+
+    # Keep the game going when the ship runs out.
+    if not ai_game.stats.game_active:
+        ai_game._start_game()
+
+    phases = [("events", ai_game._check_events)]
+    if ai_game.state.is_playing():
+        phases += [
+            ("ship.update", lambda: ai_game.ship.update(dt)),
+            ("_update_bullets", lambda: ai_game._update_bullets(dt)),
+            ("_update_aliens", lambda: ai_game._update_aliens(dt)),
+        ]
+    else:
+        phases.append(("state", lambda: ai_game.state.update(dt)))
+
+    if workload["extra"] == "level_up":
+        phases.append(("level_up", lambda: level_up(ai_game)))
+    elif workload["extra"] == "create_fleet":
+        phases.append(("create_fleet", ai_game._create_fleet))
+    phases.append(("_update_screen", ai_game._update_screen))
+
+    frame_start = time.perf_counter()
+    for name, phase in phases:
+        start = time.perf_counter()
+        phase()
+        timings.setdefault(name, []).append(time.perf_counter() - start)
+    return time.perf_counter() - frame_start
+
+
+def level_up(ai_game):
+    """Start the next level straight away."""
+    # Go back to the starting speed now and then, so the aliens don't fly off.
+    if ai_game.stats.level % 20 == 0:
+        ai_game._start_game()
+    ai_game._start_new_level()
+
+
+def run_workload(name, frames):
+    """Run one workload for a number of frames and return its results."""
+    workload = WORKLOADS[name]
+    ai_game = make_game(*workload["size"])
+
+    # Warm up, so one-off costs don't count.
+    for frame_number in range(min(60, frames)):
+        run_frame(ai_game, frame_number, workload, {})
+
+    timings = {}
+    frame_times = []
+    gc_before = sum(stat["collections"] for stat in gc.get_stats())
+    start = time.perf_counter()
+    for frame_number in range(frames):
+        frame_times.append(run_frame(ai_game, frame_number, workload, timings))
+    elapsed = time.perf_counter() - start
+    gc_collections = sum(stat["collections"] for stat in gc.get_stats()) - gc_before
+
+    # Measure allocations in a shorter, separate run, as tracing is slow.
+    alloc_frames = max(1, frames // 10)
+    allocated = []
+    tracemalloc.start()
+    for frame_number in range(alloc_frames):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        run_frame(ai_game, frame_number, workload, {})
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    frame_ms = np.array(frame_times) * 1000
+    return {
+        "screen_size": list(workload["size"]),
+        "frames": frames,
+        "aliens": len(ai_game.aliens),
+        "bullets": len(ai_game.bullets),
+        "fps": frames / elapsed,
+        "frame_ms_mean": float(frame_ms.mean()),
+        "frame_ms_p50": float(np.percentile(frame_ms, 50)),
+        "frame_ms_p99": float(np.percentile(frame_ms, 99)),
+        "phase_ms_mean": {phase: statistics.fmean(times) * 1000
+                          for phase, times in timings.items()},
+        "alloc_bytes_per_frame": statistics.fmean(allocated),
+        "gc_collections": gc_collections,
+    }
+
+
+def measure_startup(runs):
+    """Start the game runs times, each in a new process.
+        Return the median time of each startup step, and up to the first frame.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT],
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.splitlines()[-1]))
+
+    steps_ms = {step: statistics.median(sample[step] for sample in samples) * 1000
+                for step in samples[0]}
+    return {
+        "runs": runs,
+        "first_frame_ms": statistics.median(sum(sample.values())
+                                            for sample in samples) * 1000,
+        "steps_ms": steps_ms,
+    }
+
+
+def git_commit():
+    """Return the current git commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, previous=None):
+    """Print a table of results, with the change from a previous run if given."""
+    for name, result in results["workloads"].items():
+        line = (f"{name:14} {result['fps']:9.1f} fps  p50 {result['frame_ms_p50']:7.3f} ms"
+                f"  p99 {result['frame_ms_p99']:7.3f} ms"
+                f"  {result['alloc_bytes_per_frame']:9.0f} B/frame")
+        if previous and name in previous["workloads"]:
+            old_fps = previous["workloads"][name]["fps"]
+            line += f"  ({(result['fps'] / old_fps - 1) * 100:+.1f}% fps)"
+        print(line)
+        phases = ", ".join(f"{phase} {ms:.3f}"
+                           for phase, ms in result["phase_ms_mean"].items())
+        print(f"{'':14} ms per frame: {phases}")
+
+    startup = results.get("startup")
+    if startup:
+        line = f"{'startup':14} {startup['first_frame_ms']:9.1f} ms to first frame"
+        if previous and previous.get("startup"):
+            old_ms = previous["startup"]["first_frame_ms"]
+            line += f"  ({(startup['first_frame_ms'] / old_ms - 1) * 100:+.1f}%)"
+        print(line)
+        steps = ", ".join(f"{step} {ms:.1f}" for step, ms in startup["steps_ms"].items())
+        print(f"{'':14} ms per step: {steps}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the Alien Invasion game loop.")
+    parser.add_argument("--frames", type=int, default=2000,
+                        help="frames to run for each workload")
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS),
+                        default=list(WORKLOADS), help="workloads to run")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="file to write the results to")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="results of an earlier run to compare against")
+    parser.add_argument("--startup-runs", type=int, default=5,
+                        help="cold starts to time (0 to skip)")
+    args = parser.parse_args()
+
+    results = {
+        "commit": git_commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "workloads": {name: run_workload(name, args.frames) for name in args.workloads},
+        "startup": measure_startup(args.startup_runs) if args.startup_runs else None,
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_results(results, previous)
+    print(f"Results written to {args.output}", file=sys.stderr)
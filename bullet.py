@@ -1,34 +1,132 @@
+import copy
+
+import numpy as np
 import pygame
-from pygame.sprite import Sprite
 
-class Bullet(Sprite):
-    """A class to manage bullets fired from the ship."""
+class BulletPool:
+    """A class to manage the bullets fired from the ship.
+        There is one slot for each bullet allowed on screen. Slots are reused,
+         so firing and moving bullets doesn't create any new objects.
+    """
 
     def __init__(self, ai_game):
-        """Create a bullet object at the ship's current position."""
-        super().__init__()
+        """Create the bullet image and an empty slot for every bullet allowed."""
         self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.color = self.settings.bullet_color
+        self.ship = ai_game.ship
+        self.width = self.settings.bullet_width
+        self.height = self.settings.bullet_height
+
+        # Every bullet is drawn by blitting the same filled surface.
+        self.image = pygame.Surface((self.width, self.height))
+        self.image.fill(self.settings.bullet_color)
+        if pygame.display.get_surface() is not None:
+            self.image = self.image.convert()
+
+        self._create_slots()
+
+    def _create_slots(self):
+        """Make one slot for every bullet allowed on the screen."""
+        self.capacity = self.settings.bullets_allowed
+
+        # Each bullet keeps its left edge, and its decimal top position.
+        self.x = np.zeros(self.capacity, dtype=int)
+        self.y = np.zeros(self.capacity)
+        self.previous_y = np.zeros(self.capacity)
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.number_alive = 0
+
+        # Number of each bullet in the order it was fired. Slots are reused
+        #  out of order, so this is what puts the bullets in firing order.
+        self.fired = np.zeros(self.capacity, dtype=np.int64)
+        self.fire_count = 0
+
+        # Work space, so updating the bullets doesn't allocate new arrays.
+        self._tops = np.zeros(self.capacity)
+        self._on_screen = np.zeros(self.capacity, dtype=bool)
+
+    def snapshot(self):
+        """Return a copy of the pool that can be drawn while this one moves on."""
+        pool = copy.copy(self)
+        pool.x = self.x.copy()
+        pool.y = self.y.copy()
+        pool.previous_y = self.previous_y.copy()
+        pool.alive = self.alive.copy()
+        return pool
+
+    def __len__(self):
+        """Return the number of bullets on the screen."""
+        return self.number_alive
+
+    def empty(self):
+        """Remove every bullet from the screen."""
+        # Make more room if the number of bullets allowed has changed.
+        if self.capacity != self.settings.bullets_allowed:
+            self._create_slots()
+        self.alive[:] = False
+        self.number_alive = 0
+
+    def fire(self):
+        """Fire a bullet from the top of the ship, if a slot is free.
+            Return True if a bullet was fired.
+        """
+        if self.number_alive >= self.capacity:
+            return False
+
+        # Take the first free slot.
+        slot = int(self.alive.argmin())
 
-        # Create a bullet rect at (0.0) and then set correct position.
-        self.rect = pygame.Rect(0, 0, self.settings.bullet_width, 
-                                self.settings.bullet_height)
-        
         #  Make the bullet emerge from the top of the ship
-        self.rect.midtop = ai_game.ship.rect.midtop
+        self.x[slot] = self.ship.rect.centerx - self.width // 2
+        self.y[slot] = self.previous_y[slot] = self.ship.rect.top
+        self.alive[slot] = True
+        self.number_alive += 1
+        self.fired[slot] = self.fire_count
+        self.fire_count += 1
+        return True
+
+    def kill(self, slots):
+        """Remove the bullets in slots from the screen."""
+        self.alive[slots] = False
+        self.number_alive = int(np.count_nonzero(self.alive))
+
+    def between(self, top, bottom):
+        """Find the bullets that reach between the heights top and bottom.
+            Return lists of their slots, left edges and top edges,
+             in the order the bullets were fired.
+        """
+        tops = np.floor(self.y + 0.5).astype(int)
+        slots = np.flatnonzero(self.alive & (tops < bottom)
+                               & (tops + self.height > top))
+        slots = slots[np.argsort(self.fired[slots])]
+        return slots.tolist(), self.x[slots].tolist(), tops[slots].tolist()
 
-        # Store the bullet's position as a decimal value
-        self.y = float(self.rect.y)
+    def update(self, dt):
+        """Move every bullet up the screen, and get rid of bullets that have
+            gone past the top of the screen.
+            dt is the length of the tick in seconds.
+        """
+        self.previous_y[:] = self.y
+        self.y -= self.settings.bullet_speed * dt
 
-    def update(self):
-        """Move the bullet up the screen."""
-        # Update the decimal position of the bullet.
-        self.y -= self.settings.bullet_speed
+        # A bullet is gone once its bottom edge reaches the top of the screen.
+        np.add(self.y, 0.5, out=self._tops)
+        np.floor(self._tops, out=self._tops)
+        np.greater(self._tops, -self.height, out=self._on_screen)
+        np.logical_and(self.alive, self._on_screen, out=self.alive)
+        self.number_alive = int(np.count_nonzero(self.alive))
 
-        # Update the rect position
-        self.rect.y = self.y
+    def draw(self, alpha=1.0):
+        """Draw every bullet in one batch, and return the rects drawn on.
+            alpha is how far the frame is between the previous tick and this one.
+        """
+        if not self.number_alive:
+            return []
 
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
\ No newline at end of file
+        if self.settings.interpolate:
+            y = self.previous_y + (self.y - self.previous_y) * alpha
+        else:
+            y = self.y
+        positions = zip(self.x[self.alive].tolist(),
+                        np.floor(y[self.alive] + 0.5).astype(int).tolist())
+        return self.screen.blits([(self.image, position) for position in positions])
@@ -5,13 +5,14 @@ class Button:
     def __init__(self, ai_game, msg):
         """Initialise button attributes."""
         self.screen = ai_game.screen
+        self.text_cache = ai_game.text_cache
         self.screen_rect = self.screen.get_rect()
 
         # Set the dimensions and properties of the button.
         self.width, self.height = 200, 50
         self.button_color = (250,4,50)
         self.text_color = (255,255,255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.font(48)
 
         # Build the button's rect object and center it. 
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -22,12 +23,14 @@ class Button:
     
     def draw_button(self):
         # Draw blank button and then draw message.
+        #  Return the rect that was drawn on.
         self.screen.fill(self.button_color, self.rect)
         self.screen.blit(self.msg_image, self.msg_image_rect)
+        return self.rect
 
     def _prep_msg(self, msg):
         """Turn msg into a rendered image and center text on the button."""
-        self.msg_image = self.font.render(msg, True, self.text_color,
-                                          self.button_color)
+        self.msg_image = self.text_cache.render(self.font, msg, self.text_color,
+                                                self.button_color)
         self.msg_image_rect = self.msg_image.get_rect()
         self.msg_image_rect.center = self.rect.center
\ No newline at end of file
@@ -0,0 +1,202 @@
+# Watch or play a game running on an Alien Invasion server.
+#  Usage: python client.py [--host 127.0.0.1] [--port 8765] [--play]
+#  With --stats SECONDS, no window is opened: the client just listens,
+#   and reports how many snapshots and bytes it received.
+
+import argparse
+import asyncio
+from collections import deque
+
+import pygame
+
+import network
+from settings import Settings
+from assets import Assets
+
+
+class GameClient:
+    """A class to receive snapshots from a server and smooth between them."""
+
+    def __init__(self, settings):
+        """Initialise a client that isn't connected yet."""
+        self.settings = settings
+        self.snapshots = deque(maxlen=32)
+        self.latest = None
+        self.writer = None
+        self.bytes_received = 0
+
+        # Difference between the client's clock and the server's game clock.
+        self.clock_offset = None
+
+    async def connect(self, host, port, role):
+        """Connect to the server as a network.PLAYER or network.SPECTATOR."""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(role)
+        await self.writer.drain()
+
+    async def receive(self):
+        """Receive snapshots until the server disconnects."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                message = await network.read_message(self.reader)
+                self.bytes_received += len(message) + network.LENGTH.size
+                self.latest = network.decode_snapshot(message, self.latest)
+
+                # Put the snapshot on the server's clock, measured by game ticks.
+                server_time = self.latest.tick / self.settings.tick_rate
+                offset = loop.time() - server_time
+                if self.clock_offset is None or offset < self.clock_offset:
+                    self.clock_offset = offset
+                self.snapshots.append((server_time, self.latest))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def send_keys(self, keys):
+        """Send the player's keys to the server as one byte."""
+        self.writer.write(bytes([keys]))
+
+    def interpolated(self, now):
+        """Return the game as it was a short delay before now,
+            smoothed between the two snapshots either side of that moment.
+        """
+        if self.clock_offset is None:
+            return None
+        render_time = now - self.clock_offset - self.settings.client_interpolation_delay
+
+        # Find the snapshots just before and just after the moment to draw.
+        before = after = None
+        for server_time, snapshot in self.snapshots:
+            if server_time <= render_time:
+                before = (server_time, snapshot)
+            else:
+                after = (server_time, snapshot)
+                break
+        if before is None:
+            return self.snapshots[0][1]
+        if after is None:
+            return before[1]
+
+        amount = (render_time - before[0]) / (after[0] - before[0])
+        old, new = before[1], after[1]
+        return new._replace(
+            ship_x=round(old.ship_x + (new.ship_x - old.ship_x) * amount),
+            aliens=self._blend(old.aliens, new.aliens, amount),
+            bullets=self._blend(old.bullets, new.bullets, amount),
+        )
+
+    def _blend(self, old, new, amount):
+        """Move every position in new back towards where it was in old."""
+        blended = {}
+        for slot, (x, y) in new.items():
+            old_position = old.get(slot)
+            if old_position is not None:
+                x = round(old_position[0] + (x - old_position[0]) * amount)
+                y = round(old_position[1] + (y - old_position[1]) * amount)
+            blended[slot] = (x, y)
+        return blended
+
+
+class ClientView:
+    """A class to draw the snapshots a client receives in a window."""
+
+    def __init__(self, client, screen_size):
+        """Open a window the same size as the server's screen."""
+        self.client = client
+        self.settings = client.settings
+        # Initialise only the parts of Pygame the client needs.
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode(screen_size)
+        pygame.display.set_caption("Alien Invasion (network)")
+
+        assets = Assets()
+        self.alien_image = assets.image("images/alien.bmp")
+        self.ship_image = assets.image("images/ship_compressed.bmp")
+        self.bullet_image = pygame.Surface(
+            (self.settings.bullet_width, self.settings.bullet_height))
+        self.bullet_image.fill(self.settings.bullet_color)
+        self.font = assets.font(48)
+        self.text_color = (251, 206, 48)
+
+    def draw(self, snapshot):
+        """Draw one snapshot and show it."""
+        self.screen.fill(self.settings.bg_color)
+        screen_rect = self.screen.get_rect()
+
+        ship_top = screen_rect.bottom - self.ship_image.get_height()
+        self.screen.blit(self.ship_image, (snapshot.ship_x, ship_top))
+        self.screen.blits([(self.bullet_image, position)
+                           for position in snapshot.bullets.values()], doreturn=False)
+        self.screen.blits([(self.alien_image, position)
+                           for position in snapshot.aliens.values()], doreturn=False)
+
+        text = (f"{snapshot.score:,}   Lvl {snapshot.level}   "
+                f"Ships {snapshot.ships_left}   {snapshot.state.replace('_', ' ')}")
+        self.screen.blit(self.font.render(text, True, self.text_color), (10, 10))
+        pygame.display.flip()
+
+
+async def watch(client, play):
+    """Show the game in a window, and send keys if playing."""
+    loop = asyncio.get_running_loop()
+    while client.latest is None:
+        await asyncio.sleep(0.01)
+    view = ClientView(client, client.latest.screen_size)
+
+    held_keys = 0
+    while True:
+        pressed_keys = 0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (
+                    event.type == pygame.KEYDOWN and event.key == pygame.K_q):
+                return
+            if not play or event.type not in (pygame.KEYDOWN, pygame.KEYUP):
+                continue
+
+            down = event.type == pygame.KEYDOWN
+            if event.key == pygame.K_LEFT:
+                held_keys = held_keys | network.LEFT if down else held_keys & ~network.LEFT
+            elif event.key == pygame.K_RIGHT:
+                held_keys = held_keys | network.RIGHT if down else held_keys & ~network.RIGHT
+            elif event.key == pygame.K_SPACE and down:
+                pressed_keys |= network.FIRE
+            elif event.key == pygame.K_p and down:
+                pressed_keys |= network.START
+            client.send_keys(held_keys | pressed_keys)
+            pressed_keys = 0
+
+        snapshot = client.interpolated(loop.time())
+        if snapshot is not None:
+            view.draw(snapshot)
+        await asyncio.sleep(1 / view.settings.max_fps)
+
+
+async def main(args):
+    """Connect to the server, then watch, play or collect stats."""
+    settings = Settings()
+    client = GameClient(settings)
+    role = network.PLAYER if args.play else network.SPECTATOR
+    await client.connect(args.host, args.port, role)
+    receiver = asyncio.create_task(client.receive())
+
+    if args.stats:
+        await asyncio.sleep(args.stats)
+        latest_tick = client.latest.tick if client.latest else None
+        print(f"Latest tick {latest_tick}, "
+              f"{client.bytes_received / args.stats:,.0f} bytes per second")
+    else:
+        await watch(client, args.play)
+    receiver.cancel()
+    client.writer.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Connect to an Alien Invasion server.")
+    parser.add_argument("--host", default="127.0.0.1", help="server address")
+    parser.add_argument("--port", type=int, default=8765, help="server port")
+    parser.add_argument("--play", action="store_true",
+                        help="play instead of watching (one player at a time)")
+    parser.add_argument("--stats", type=float, metavar="SECONDS",
+                        help="listen without a window, then print what was received")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+import math
+
+class GridIndex:
+    """A class to find the aliens near a rect when the fleet is a regular grid.
+        The column and row under a rect are worked out directly,
+         so no alien has to be looked at unless it could be touching the rect.
+    """
+
+    def __init__(self, columns, rows, spacing_x, spacing_y):
+        """Store the shape of the grid.
+            Alien number (row * columns + column) sits spacing_x pixels
+             to the right of its neighbour, and spacing_y pixels below.
+        """
+        self.columns = columns
+        self.rows = rows
+        self.spacing_x = spacing_x
+        self.spacing_y = spacing_y
+
+    def candidates(self, left, top, right, bottom, origin_x, origin_y):
+        """Return the index of every alien that could overlap the rect.
+            origin_x and origin_y are the position of the first alien.
+        """
+        # Go one column and row further on each side,
+        #  so rounding of the alien positions can never hide a hit.
+        first_column = max(0, math.floor((left - origin_x) / self.spacing_x) - 1)
+        last_column = min(self.columns - 1,
+                          math.floor((right - origin_x) / self.spacing_x) + 1)
+        first_row = max(0, math.floor((top - origin_y) / self.spacing_y) - 1)
+        last_row = min(self.rows - 1,
+                       math.floor((bottom - origin_y) / self.spacing_y) + 1)
+
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                yield row * self.columns + column
+
+
+class SpatialHash:
+    """A class to find the aliens near a rect for a fleet of any layout.
+        The fleet always moves as one, so aliens are filed into cells once,
+         by their position relative to the first alien.
+    """
+
+    def __init__(self, lefts, tops, width, height, cell_width, cell_height):
+        """File every alien into each cell its rect touches."""
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+
+        # Key: (column, row) of a cell. Value: list of aliens in that cell.
+        self.cells = {}
+        if not len(lefts):
+            return
+
+        origin_x, origin_y = lefts[0], tops[0]
+        for index, (left, top) in enumerate(zip(lefts, tops)):
+            for cell in self._cells(left - origin_x, top - origin_y,
+                                    left - origin_x + width,
+                                    top - origin_y + height):
+                self.cells.setdefault(cell, []).append(index)
+
+    def _cells(self, left, top, right, bottom):
+        """Return the (column, row) of every cell the rect touches."""
+        for row in range(math.floor(top / self.cell_height),
+                         math.floor(bottom / self.cell_height) + 1):
+            for column in range(math.floor(left / self.cell_width),
+                                math.floor(right / self.cell_width) + 1):
+                yield column, row
+
+    def candidates(self, left, top, right, bottom, origin_x, origin_y):
+        """Return the index of every alien that could overlap the rect.
+            origin_x and origin_y are the position of the first alien.
+        """
+        # Go one pixel further on each side,
+        #  so rounding of the alien positions can never hide a hit.
+        found = set()
+        for cell in self._cells(left - origin_x - 1, top - origin_y - 1,
+                                right - origin_x + 1, bottom - origin_y + 1):
+            found.update(self.cells.get(cell, ()))
+        return found
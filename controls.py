@@ -0,0 +1,111 @@
+import time
+from collections import deque
+
+import pygame
+
+from profiler import percentiles
+
+# Bits of the actions a player can take in one tick.
+#  Left and right are held until the key is released, fire and start happen once.
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+START = 8
+HELD = LEFT | RIGHT
+
+# Posted by the simulation thread when a game starts or ends, to wake the
+#  main thread up if it is waiting for input.
+WAKE_UP = pygame.event.custom_type()
+
+# The only kinds of event the game responds to.
+EVENT_TYPES = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+               pygame.VIDEOEXPOSE, WAKE_UP]
+
+
+class InputHandler:
+    """A class to collect the player's input and apply it once per tick.
+        Key events only set bits. However many come in between two ticks,
+         the ship's movement is set, and a bullet fired, once at the next tick.
+    """
+
+    def __init__(self, ai_game):
+        """Initialise the handler, and leave every other kind of event
+            out of the event queue.
+        """
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+
+        # Actions held down, and actions pressed since the last tick.
+        #  A key pressed and released between two ticks still counts as
+        #   pressed, so a quick tap moves the ship for one tick.
+        self.held = 0
+        self.pressed = 0
+
+        # Time the oldest input not yet shown on screen came in,
+        #  and whether a tick has acted on it yet.
+        self.input_time = None
+        self.input_applied = False
+        # Seconds from each input to the first frame that shows it.
+        self.latencies = deque(maxlen=self.settings.profiler_history)
+
+        if not self.settings.headless:
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(EVENT_TYPES)
+
+    def get_events(self, wait=None):
+        """Return the events in the queue.
+            If wait is a number of seconds, wait up to that long for the
+             first event, instead of returning straight away with none.
+        """
+        if wait is None:
+            return pygame.event.get()
+
+        event = pygame.event.wait(int(wait * 1000))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def press(self, action):
+        """Ask for action at the next tick. Left and right are also held
+            until they are released.
+        """
+        if action & HELD:
+            self.held |= action
+        self.pressed |= action
+        if self.input_time is None:
+            self.input_time = time.perf_counter()
+
+    def release(self, action):
+        """Stop a held action."""
+        self.held &= ~action
+
+    def apply(self):
+        """Act on the input for one tick."""
+        actions = self.held | self.pressed
+        self.pressed = 0
+
+        ship = self.ai_game.ship
+        ship.moving_left = bool(actions & LEFT)
+        ship.moving_right = bool(actions & RIGHT)
+        if actions & START:
+            self.ai_game._start_game()
+        if actions & FIRE:
+            self.ai_game._fire_bullet()
+
+        if self.input_time is not None:
+            self.input_applied = True
+
+    def frame_shown(self):
+        """Measure the input latency, once a frame that shows the input is shown."""
+        if self.input_applied:
+            self.latencies.append(time.perf_counter() - self.input_time)
+            self.input_time = None
+            self.input_applied = False
+
+    def latency(self):
+        """Return the median, 99th percentile and longest input latency
+            in milliseconds, or None if nothing has been measured yet.
+        """
+        if not self.latencies:
+            return None
+        return percentiles(self.latencies)
@@ -0,0 +1,243 @@
+import copy
+import math
+
+import numpy as np
+import pygame
+
+from fleet_layer import FleetLayer
+from formation import Formation
+
+class Fleet:
+    """A class to manage the alien fleet.
+        Positions and alive flags of every alien are kept in arrays,
+         so the whole fleet is moved and checked in one step.
+    """
+
+    def __init__(self, ai_game):
+        """Initialise an empty fleet and the image shared by every alien."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # Every alien is drawn with the same image.
+        self.image = ai_game.assets.image("images/alien.bmp")
+        self.width, self.height = self.image.get_rect().size
+
+        # Start with empty arrays, which the first spawn replaces.
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.previous_x = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+        self.hit_points = np.zeros(0, dtype=int)
+
+        # Layer the fleet is drawn from, made again only when the formation changes.
+        self.layer = None
+        self.empty()
+
+    def empty(self):
+        """Remove every alien from the fleet."""
+        self.spawn(Formation([], [], self.width, self.height))
+
+    def spawn(self, formation):
+        """Replace the fleet with a new one laid out like formation."""
+        # Reuse the arrays when the new fleet is the same size as the old one.
+        if len(formation) == len(self.x):
+            self.x[:] = formation.x
+            self.y[:] = formation.y
+            self.previous_x[:] = formation.x
+            self.alive[:] = True
+            self.hit_points[:] = formation.hit_points
+        else:
+            # Store the exact positions as decimal values.
+            self.x = formation.x.copy()
+            self.y = formation.y.copy()
+
+            # Remember where the aliens were on the previous tick,
+            #  so they can be drawn smoothly between ticks.
+            self.previous_x = formation.x.copy()
+
+            # An alien that has been shot stays in the arrays, 
+            #  but is no longer alive.
+            self.alive = np.ones(len(self.x), dtype=bool)
+
+            # Hits each alien can still take before it is destroyed.
+            self.hit_points = formation.hit_points.copy()
+
+        # Points each alien is worth, as a multiple of the level's alien points.
+        self.points = formation.points
+
+        self.number_alive = len(self.x)
+
+        # Count the aliens alive in each column and row,
+        #  so questions about the fleet don't have to look at every alien.
+        self.column_of = formation.column_of
+        self.row_of = formation.row_of
+        self.column_lefts = formation.column_lefts
+        self.row_tops = formation.row_tops
+        self.column_alive = np.bincount(self.column_of,
+                                        minlength=len(self.column_lefts))
+        self.row_alive = np.bincount(self.row_of, minlength=len(self.row_tops))
+
+        # The formation's index finds the aliens a bullet could hit.
+        self.index = formation.index
+        self.formation = formation
+
+        # Keep the layer while the same formation is spawned again and again, 
+        #  so only the cells of aliens that died last time are drawn again.
+        if len(formation) and (self.layer is None
+                               or self.layer.formation is not formation):
+            self.layer = FleetLayer(formation, self.image)
+
+    def snapshot(self):
+        """Return a copy of the fleet that can be drawn while this one moves on."""
+        fleet = copy.copy(self)
+        fleet.x = self.x.copy()
+        fleet.y = self.y.copy()
+        fleet.previous_x = self.previous_x.copy()
+        fleet.alive = self.alive.copy()
+        return fleet
+
+    def __len__(self):
+        """Return the number of aliens still alive."""
+        return self.number_alive
+
+    def lefts(self):
+        """Return the left edge of every alien, in whole pixels."""
+        return np.floor(self.x + 0.5).astype(int)
+
+    def tops(self):
+        """Return the top edge of every alien, in whole pixels."""
+        return np.floor(self.y + 0.5).astype(int)
+
+    def kill(self, indices):
+        """Remove the aliens at indices from the fleet.
+            indices can also be an array of True or False for every alien.
+        """
+        # Only count the aliens that were still alive, and each one only once.
+        indices = np.unique(np.arange(len(self.alive))[indices])
+        indices = indices[self.alive[indices]]
+        self._count_killed(indices)
+        self.alive[indices] = False
+        self.number_alive = int(np.count_nonzero(self.alive))
+
+    def _count_killed(self, indices):
+        """Take the aliens at indices off the counts of their columns and rows."""
+        np.subtract.at(self.column_alive, self.column_of[indices], 1)
+        np.subtract.at(self.row_alive, self.row_of[indices], 1)
+
+    def update(self, dt):
+        """Move the whole fleet right or left.
+            dt is the length of the tick in seconds.
+        """
+        self.previous_x[:] = self.x
+        self.x += self.settings.alien_speed * self.settings.fleet_direction * dt
+
+    def check_edges(self):
+        """Return True if any alien is at the edge of screen."""
+        if not self.number_alive:
+            return False
+
+        lefts = self.lefts()[self.alive]
+        return (lefts.min() <= 0
+                or lefts.max() + self.width >= self.screen.get_rect().right)
+
+    def drop(self, distance):
+        """Move the whole fleet down by distance pixels."""
+        self.y += distance
+
+    def reached_bottom(self, bottom):
+        """Return True if any alien has reached bottom."""
+        if not self.number_alive:
+            return False
+        return self.tops()[self.alive].max() + self.height >= bottom
+
+    def collide_rect(self, rect):
+        """Return True if any alien overlaps rect."""
+        lefts = self.lefts()
+        tops = self.tops()
+        overlap = (self.alive
+                   & (lefts < rect.right) & (lefts + self.width > rect.left)
+                   & (tops < rect.bottom) & (tops + self.height > rect.top))
+        return bool(overlap.any())
+
+    def collide_bullets(self, bullets):
+        """Take a hit point from every alien hit by a bullet, and remove the
+            aliens that have none left.
+            Return a dictionary like pygame.sprite.groupcollide().
+             Key: slot of a bullet that hit something. 
+             Value: list of indices of the aliens it destroyed.
+        """
+        collisions = {}
+        if not self.number_alive:
+            return collisions
+
+        # Only bullets level with the fleet can hit anything.
+        x, y, alive = self.x, self.y, self.alive
+        tops = self.tops()[alive]
+        slots, bullet_lefts, bullet_tops = bullets.between(
+            int(tops.min()), int(tops.max()) + self.height)
+
+        # Only the aliens the index finds near a bullet are checked,
+        #  so the cost doesn't grow with the size of the fleet.
+        origin_x = math.floor(x[0] + 0.5)
+        origin_y = math.floor(y[0] + 0.5)
+        for slot, left, top in zip(slots, bullet_lefts, bullet_tops):
+            right = left + bullets.width
+            bottom = top + bullets.height
+            hit = []
+            for index in self.index.candidates(left, top, right, bottom,
+                                               origin_x, origin_y):
+                if not alive[index]:
+                    continue
+                alien_left = math.floor(x[index] + 0.5)
+                alien_top = math.floor(y[index] + 0.5)
+                if (alien_left < right and alien_left + self.width > left
+                        and alien_top < bottom and alien_top + self.height > top):
+                    hit.append(index)
+            if hit:
+                # Take the hit straight away, so the next bullet sees it.
+                hit.sort()
+                self.hit_points[hit] -= 1
+                destroyed = [index for index in hit if self.hit_points[index] <= 0]
+                alive[destroyed] = False
+                self.number_alive -= len(destroyed)
+                self._count_killed(destroyed)
+                collisions[slot] = destroyed
+
+        return collisions
+
+    def draw(self, alpha=1.0):
+        """Draw every alien that is still alive, from the fleet's layer when
+            it has one that fits.
+            alpha is how far the frame is between the previous tick and this one.
+             Return a list of the rects that were drawn on.
+        """
+        if not self.number_alive:
+            return []
+
+        # The whole fleet moves as one, so it can be drawn from its layer 
+        #  with one blit for each row, at the position of the first alien.
+        layer = self.layer
+        if layer.formation is self.formation and layer.usable:
+            if self.settings.interpolate:
+                first_x = (self.previous_x[0]
+                           + (self.x[0] - self.previous_x[0]) * alpha)
+            else:
+                first_x = self.x[0]
+            first_y = self.y[0]
+            return layer.draw(self.screen, math.floor(first_x + 0.5),
+                              math.floor(first_y + 0.5), self.alive)
+
+        if self.settings.interpolate:
+            x = self.previous_x + (self.x - self.previous_x) * alpha
+        else:
+            x = self.x
+        lefts = np.floor(x[self.alive] + 0.5).astype(int)
+        tops = self.tops()[self.alive]
+        self.screen.blits([(self.image, position) for position
+                           in zip(lefts.tolist(), tops.tolist())],
+                          doreturn=False)
+
+        left, top = int(lefts.min()), int(tops.min())
+        return [pygame.Rect(left, top,
+                            int(lefts.max()) + self.width - left,
+                            int(tops.max()) + self.height - top)]
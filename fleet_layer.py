@@ -0,0 +1,114 @@
+import numpy as np
+import pygame
+
+class FleetLayer:
+    """A class to draw a whole fleet with one blit for each row of aliens.
+        The aliens never move relative to each other, so each row is drawn
+         once onto a strip of its own. When an alien dies only its cell is
+         painted over, and the strips are then blitted wherever the fleet is.
+    """
+
+    # Colour of the see-through parts of the strips.
+    CLEAR = (0, 0, 0, 0)
+
+    def __init__(self, formation, image):
+        """Work out the cell of every alien in formation, relative to the
+            first alien. The strips themselves are only made when first drawn.
+        """
+        self.formation = formation
+        self.image = image
+        self.width, self.height = image.get_rect().size
+        self.strips = None
+
+        # Which aliens are drawn on the strips at the moment.
+        self.painted = np.zeros(len(formation), dtype=bool)
+
+        self.usable = self._find_cells(formation)
+
+    def _find_cells(self, formation):
+        """Store the row and cell of each alien.
+            Return False if the formation can't be drawn in strips.
+        """
+        if not len(formation):
+            return False
+
+        # Each alien has to be a whole number of pixels from the first one,
+        #  so it is rounded to the same pixel as when drawn on its own.
+        offset_x = formation.x - formation.x[0]
+        offset_y = formation.y - formation.y[0]
+        cell_x = np.round(offset_x)
+        cell_y = np.round(offset_y)
+        if (np.abs(offset_x - cell_x).max() > 1e-6
+                or np.abs(offset_y - cell_y).max() > 1e-6):
+            return False
+
+        # Put the leftmost alien at the left edge of the strips.
+        self.min_x = int(cell_x.min())
+        self.cell_x = cell_x.astype(int) - self.min_x
+        self.strip_width = int(self.cell_x.max()) + self.width
+
+        # Number of the row each alien is in. Each row also keeps its height
+        #  relative to the first alien, and the aliens in it.
+        row_tops, self.row_of = np.unique(cell_y.astype(int), return_inverse=True)
+        self.row_tops = row_tops.tolist()
+        self.row_members = [np.flatnonzero(self.row_of == row)
+                            for row in range(len(self.row_tops))]
+
+        # Aliens that overlap would paint over each other when one dies,
+        #  so there must be room for a whole alien between rows and columns.
+        if (np.diff(row_tops) < self.height).any():
+            return False
+        for members in self.row_members:
+            if (np.diff(np.sort(self.cell_x[members])) < self.width).any():
+                return False
+        return True
+
+    def _create_strips(self):
+        """Make an empty, see-through strip for every row."""
+        self.strips = []
+        for _ in self.row_tops:
+            # The alien image has see-through edges, so each strip needs an
+            #  alpha channel of its own, just like the image.
+            strip = pygame.Surface((self.strip_width, self.height), pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                strip = strip.convert_alpha()
+            strip.fill(self.CLEAR)
+
+            # Run-length encoding lets a blit skip the gaps between aliens.
+            strip.set_alpha(255, pygame.RLEACCEL)
+            self.strips.append(strip)
+        self.painted[:] = False
+
+    def draw(self, screen, left, top, alive):
+        """Draw the aliens that are alive, with the first alien at (left, top).
+            Return the rects that were drawn on.
+        """
+        if self.strips is None:
+            self._create_strips()
+
+        # Paint over the aliens that died, and draw any that came back.
+        #  Only the strips of those rows have to be encoded again.
+        changed = np.flatnonzero(alive != self.painted)
+        for index in changed.tolist():
+            strip = self.strips[self.row_of[index]]
+            cell = (int(self.cell_x[index]), 0)
+            strip.fill(self.CLEAR, (cell, (self.width, self.height)))
+            if alive[index]:
+                # Adding the image to a clear cell copies its pixels exactly,
+                #  where a normal blit would blend them with the clear colour.
+                strip.blit(self.image, cell, special_flags=pygame.BLEND_RGBA_ADD)
+        self.painted[changed] = alive[changed]
+
+        # Blit the part of each strip between its first and last living alien.
+        blits = []
+        for strip, row_top, members in zip(self.strips, self.row_tops,
+                                           self.row_members):
+            lefts = self.cell_x[members[alive[members]]]
+            if not len(lefts):
+                continue
+            area_left = int(lefts.min())
+            area = (area_left, 0, int(lefts.max()) + self.width - area_left,
+                    self.height)
+            blits.append((strip, (left + self.min_x + area_left, top + row_top),
+                          area))
+        return screen.blits(blits)
@@ -0,0 +1,94 @@
+from functools import lru_cache
+
+import numpy as np
+
+from collision import GridIndex, SpatialHash
+
+class Formation:
+    """A class to hold the starting position of every alien in a fleet.
+        A formation is worked out once and can spawn any number of fleets,
+         so it must not be changed once it is made.
+    """
+
+    def __init__(self, x_positions, y_positions, alien_width, alien_height,
+                 grid=None, hit_points=None, points=None):
+        """Store the positions, and build the index used to find bullet hits.
+            If the aliens are laid out row by row in a regular grid,
+             grid is (columns, rows, spacing_x, spacing_y).
+            hit_points and points give each alien's hits to destroy and the
+             points it is worth, as a multiple of the level's alien points.
+             Both are 1 for every alien if they are not given.
+        """
+        self.x = np.array(x_positions, dtype=float)
+        self.y = np.array(y_positions, dtype=float)
+        self.hit_points = np.ones(len(self.x), dtype=int)
+        self.points = np.ones(len(self.x), dtype=int)
+        if hit_points is not None:
+            self.hit_points[:] = hit_points
+        if points is not None:
+            self.points[:] = points
+        for array in (self.x, self.y, self.hit_points, self.points):
+            array.flags.writeable = False
+
+        if grid:
+            self.index = GridIndex(*grid)
+        else:
+            lefts = np.floor(self.x + 0.5).astype(int).tolist()
+            tops = np.floor(self.y + 0.5).astype(int).tolist()
+            self.index = SpatialHash(lefts, tops, alien_width, alien_height,
+                                     2 * alien_width, 2 * alien_height)
+
+        self._find_columns_and_rows()
+
+    def _find_columns_and_rows(self):
+        """Sort the aliens into columns and rows, by their whole pixel position
+            relative to the first alien. Columns are numbered left to right,
+             and rows top to bottom.
+        """
+        if len(self.x):
+            offset_x = np.floor(self.x - self.x[0] + 0.5).astype(int)
+            offset_y = np.floor(self.y - self.y[0] + 0.5).astype(int)
+        else:
+            offset_x = offset_y = np.zeros(0, dtype=int)
+
+        # Left edge of each column and top edge of each row, relative to the
+        #  first alien, and the column and row of each alien.
+        self.column_lefts, self.column_of = np.unique(offset_x, return_inverse=True)
+        self.row_tops, self.row_of = np.unique(offset_y, return_inverse=True)
+        for array in (self.column_lefts, self.column_of,
+                      self.row_tops, self.row_of):
+            array.flags.writeable = False
+
+    def __len__(self):
+        """Return the number of aliens in the formation."""
+        return len(self.x)
+
+
+@lru_cache(maxsize=16)
+def grid_formation(screen_width, screen_height, alien_width, alien_height,
+                   ship_height):
+    """Return the standard formation of rows of aliens filling the screen.
+        It is only worked out once for each screen, alien and ship size.
+    """
+    # Find the number of aliens in a row.
+    # Spacing between each alien is equal to one alien width.
+    # Keep width of one alien to the left of the first alien. 
+    available_space_x = screen_width - alien_width
+    number_aliens_x = available_space_x // (2 * alien_width)
+
+    # Determine the number of rows of aliens that fit on the screen.
+    #  Leave two alien height from the top, three alien heights from the rocket, 
+    #   and the ship height from the bottom of the screen.
+    #  Keep gap of one alien height between each row.
+    available_space_y = screen_height - (5 * alien_height) - ship_height
+    number_rows = max(0, available_space_y // (2 * alien_height))
+
+    # Work out the position of every alien at once, row by row.
+    alien_numbers = np.tile(np.arange(number_aliens_x), number_rows)
+    row_numbers = np.repeat(np.arange(number_rows), number_aliens_x)
+    x_positions = alien_width + (2 * alien_width * alien_numbers)
+    y_positions = (2 * alien_height) + (2 * alien_height * row_numbers)
+
+    return Formation(x_positions, y_positions, alien_width, alien_height,
+                     grid=(number_aliens_x, number_rows,
+                           2 * alien_width, 2 * alien_height))
@@ -0,0 +1,42 @@
+class GameState:
+    """A class to track which state the game is in, and for how much longer.
+        Timed states count down with the game clock instead of freezing the game.
+    """
+
+    # The states the game can be in.
+    PLAYING = "playing"
+    LEVEL_TRANSITION = "level_transition"
+    RESPAWN = "respawn"
+    GAME_OVER = "game_over"
+
+    def __init__(self, ai_game):
+        """Start the game on the game over screen, waiting for Play."""
+        self.settings = ai_game.settings
+        self.change(GameState.GAME_OVER)
+
+    def change(self, name, duration=0.0):
+        """Switch to the state called name, for duration seconds if it is timed."""
+        if self.settings.skip_pauses:
+            duration = 0.0
+
+        # A pause that takes no time goes straight back to playing.
+        if duration <= 0 and name in (GameState.LEVEL_TRANSITION, GameState.RESPAWN):
+            name = GameState.PLAYING
+        self.name = name
+        self.duration = duration
+        self.time_left = duration
+
+    def update(self, dt):
+        """Count down a timed state, and go back to playing when time is up."""
+        if self.is_paused():
+            self.time_left -= dt
+            if self.time_left <= 0:
+                self.change(GameState.PLAYING)
+
+    def is_playing(self):
+        """Return True if the game world should move."""
+        return self.name == GameState.PLAYING
+
+    def is_paused(self):
+        """Return True if the game is waiting between lives or levels."""
+        return self.name in (GameState.LEVEL_TRANSITION, GameState.RESPAWN)
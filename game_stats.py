@@ -4,6 +4,7 @@ class GameStats:
     def __init__(self, ai_game):
         """Initialise statistics."""
         self.settings = ai_game.settings
+        self.scores = ai_game.scores
         self.reset_stats()
 
         # Start Alien Invasion in an active state.
@@ -20,8 +21,9 @@ class GameStats:
         self.level = 1
     
     def read_high_score_file(self):
-        """Read previous high score from a file."""
-        with open("high_score.txt", 'r') as f:
-            self.high_score = int(f.read())
+        """Read previous high score from a file.
+            A missing or broken file counts as a high score of 0.
+        """
+        self.high_score = self.scores.read_high_score()
     
     
\ No newline at end of file
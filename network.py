@@ -0,0 +1,152 @@
+# Messages sent between the game server and its clients.
+#  The server sends snapshots of the game. The first snapshot a client gets
+#   is a keyframe with everything in it, and every later one is a delta:
+#   only what changed since the snapshot before it.
+#  Every message starts with its length, so it can be read from a stream.
+
+import struct
+from collections import Counter, namedtuple
+
+from controls import LEFT, RIGHT, FIRE, START
+from game_state import GameState
+
+# Kinds of snapshot.
+KEYFRAME = 1
+DELTA = 2
+
+# Header: kind, tick, score, level, ships left, game state, ship x, screen size.
+HEADER = struct.Struct("<BIqHBBhHH")
+# Table of aliens or bullets: common (dx, dy), number of slots removed and set.
+TABLE = struct.Struct("<hhHH")
+SLOT = struct.Struct("<H")
+ENTRY = struct.Struct("<Hhh")
+LENGTH = struct.Struct("<I")
+
+# Game states, numbered in the order they are sent.
+STATES = [GameState.PLAYING, GameState.LEVEL_TRANSITION, GameState.RESPAWN,
+          GameState.GAME_OVER]
+
+# The one byte input messages a player sends hold the game's own action bits:
+#  LEFT, RIGHT, FIRE and START from controls.
+#  Left and right are held until the next message, fire and start happen once.
+
+# What a client sends first to say whether it wants to play or watch.
+PLAYER = b"P"
+SPECTATOR = b"S"
+
+# Everything a client needs to draw one moment of the game.
+#  aliens and bullets are dictionaries. Key: slot. Value: (x, y).
+Snapshot = namedtuple("Snapshot", ["tick", "score", "level", "ships_left",
+                                   "state", "ship_x", "screen_size",
+                                   "aliens", "bullets"])
+
+
+def take_snapshot(ai_game):
+    """Return a snapshot of the game as it is now."""
+    aliens = ai_game.aliens
+    alien_slots = aliens.alive.nonzero()[0].tolist()
+    alien_positions = zip(aliens.lefts()[aliens.alive].tolist(),
+                          aliens.tops()[aliens.alive].tolist())
+
+    bullets = ai_game.bullets
+    bullet_slots, bullet_lefts, bullet_tops = bullets.between(-bullets.height, 2**15)
+
+    return Snapshot(
+        tick=ai_game.ticks,
+        score=ai_game.stats.score,
+        level=ai_game.stats.level,
+        ships_left=ai_game.stats.ships_left,
+        state=ai_game.state.name,
+        ship_x=ai_game.ship.rect.x,
+        screen_size=(ai_game.settings.screen_width, ai_game.settings.screen_height),
+        aliens=dict(zip(alien_slots, alien_positions)),
+        bullets=dict(zip(bullet_slots, zip(bullet_lefts, bullet_tops))),
+    )
+
+
+def encode_snapshot(snapshot, previous=None):
+    """Return snapshot as a message.
+        With a previous snapshot, only what changed since it is sent.
+    """
+    kind = KEYFRAME if previous is None else DELTA
+    parts = [HEADER.pack(kind, snapshot.tick, snapshot.score, snapshot.level,
+                         snapshot.ships_left, STATES.index(snapshot.state),
+                         snapshot.ship_x, *snapshot.screen_size)]
+    parts += _encode_table(snapshot.aliens, previous.aliens if previous else {})
+    parts += _encode_table(snapshot.bullets, previous.bullets if previous else {})
+
+    payload = b"".join(parts)
+    return LENGTH.pack(len(payload)) + payload
+
+
+def _encode_table(current, previous):
+    """Return the parts of a message describing how current differs from previous.
+        Things in a fleet move together, so the move shared by most of them
+         is sent once, and only the slots that moved differently are sent.
+    """
+    removed = [slot for slot in previous if slot not in current]
+
+    moves = Counter()
+    for slot, (x, y) in current.items():
+        old_position = previous.get(slot)
+        if old_position is not None:
+            moves[(x - old_position[0], y - old_position[1])] += 1
+    dx, dy = moves.most_common(1)[0][0] if moves else (0, 0)
+
+    changed = []
+    for slot, (x, y) in current.items():
+        old_position = previous.get(slot)
+        if old_position is None or (old_position[0] + dx, old_position[1] + dy) != (x, y):
+            changed.append(ENTRY.pack(slot, x, y))
+
+    parts = [TABLE.pack(dx, dy, len(removed), len(changed))]
+    parts += [SLOT.pack(slot) for slot in removed]
+    parts += changed
+    return parts
+
+
+def decode_snapshot(payload, previous=None):
+    """Turn a message (without its length) back into a snapshot.
+        A delta needs the snapshot it was made from.
+    """
+    (kind, tick, score, level, ships_left, state, ship_x,
+     width, height) = HEADER.unpack_from(payload)
+    if kind == DELTA and previous is None:
+        raise ValueError("A delta snapshot needs the snapshot before it.")
+    if kind == KEYFRAME:
+        previous = None
+
+    offset = HEADER.size
+    aliens, offset = _decode_table(payload, offset,
+                                   previous.aliens if previous else {})
+    bullets, offset = _decode_table(payload, offset,
+                                    previous.bullets if previous else {})
+    return Snapshot(tick, score, level, ships_left, STATES[state], ship_x,
+                    (width, height), aliens, bullets)
+
+
+def _decode_table(payload, offset, previous):
+    """Rebuild a table of positions from previous and the message at offset.
+        Return the table and the offset just after it.
+    """
+    dx, dy, number_removed, number_changed = TABLE.unpack_from(payload, offset)
+    offset += TABLE.size
+
+    removed = set()
+    for _ in range(number_removed):
+        removed.add(SLOT.unpack_from(payload, offset)[0])
+        offset += SLOT.size
+
+    table = {slot: (x + dx, y + dy) for slot, (x, y) in previous.items()
+             if slot not in removed}
+    for slot, x, y in ENTRY.iter_unpack(
+            payload[offset:offset + number_changed * ENTRY.size]):
+        table[slot] = (x, y)
+    offset += number_changed * ENTRY.size
+    return table, offset
+
+
+async def read_message(reader):
+    """Read one whole message from a stream, and return it without its length."""
+    length = LENGTH.unpack(await reader.readexactly(LENGTH.size))[0]
+    return await reader.readexactly(length)
@@ -0,0 +1,218 @@
+import cProfile
+import heapq
+import pstats
+import queue
+import time
+from collections import deque
+
+
+def percentiles(times):
+    """Return the median, the 99th percentile and the worst of times,
+        given in seconds, in milliseconds.
+    """
+    times = sorted(times)
+    last = len(times) - 1
+    return (times[last // 2] * 1000, times[last * 99 // 100] * 1000,
+            times[last] * 1000)
+
+
+class FrameProfiler:
+    """A class to time every phase of each frame and show the results on screen.
+        While it is off, the game's methods are left untouched, so it costs nothing.
+    """
+
+    # Methods of the game that are timed while the profiler is on.
+    PHASES = [
+        "_check_events",
+        "_tick",
+        "_update_bullets",
+        "_check_bullet_alien_collisions",
+        "_update_aliens",
+        "_check_fleet_edges",
+        "_check_aliens_bottom",
+        "_update_screen",
+    ]
+
+    def __init__(self, ai_game):
+        """Initialise the profiler, turned off."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.enabled = False
+        self.capture = None
+
+        # Font settings for the overlay.
+        self.text_color = (120, 255, 120)
+        self.font = ai_game.assets.font(24)
+
+    def toggle(self):
+        """Turn the profiler and its overlay on or off."""
+        if self.enabled:
+            # Remove the timed versions, so the game's own methods are used again.
+            for name in self.PHASES:
+                del self.ai_game.__dict__[name]
+            self.enabled = False
+        else:
+            self._reset()
+            for name in self.PHASES:
+                setattr(self.ai_game, name, self._timed(name, getattr(self.ai_game, name)))
+            self.enabled = True
+
+    def _reset(self):
+        """Forget every measurement."""
+        history = self.settings.profiler_history
+
+        # Rolling history of the last frames.
+        #  Key: name of a phase. Value: time spent in it, one entry per frame.
+        self.frame_times = deque(maxlen=history)
+        self.phase_times = {name: deque(maxlen=history) for name in self.PHASES}
+        self.current = dict.fromkeys(self.PHASES, 0.0)
+
+        # The slowest frames so far, as (frame time, frame number, slowest phase).
+        self.worst_frames = []
+        self.frame_number = 0
+        self.last_frame_end = time.perf_counter()
+
+        self.hud_images = []
+        self.next_hud_update = 0.0
+
+    def _timed(self, name, method):
+        """Return a version of method that adds its running time to phase name."""
+        def timed_method(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            self.current[name] += time.perf_counter() - start
+            return result
+        return timed_method
+
+    def end_frame(self):
+        """Store the measurements of the frame that has just finished."""
+        now = time.perf_counter()
+        frame_time = now - self.last_frame_end
+        self.last_frame_end = now
+
+        self.frame_times.append(frame_time)
+        for name, phase_time in self.current.items():
+            self.phase_times[name].append(phase_time)
+            self.current[name] = 0.0
+
+        # Remember the worst frames, and what took the most time in each.
+        slowest_phase = max(self.PHASES, key=lambda name: self.phase_times[name][-1])
+        worst_frame = (frame_time, self.frame_number, slowest_phase)
+        if len(self.worst_frames) < self.settings.profiler_worst_frames:
+            heapq.heappush(self.worst_frames, worst_frame)
+        else:
+            heapq.heappushpop(self.worst_frames, worst_frame)
+        self.frame_number += 1
+
+    def summary(self):
+        """Return the median, 99th percentile and worst time of each phase
+            over the rolling history, in milliseconds.
+        """
+        return {name: percentiles(times)
+                for name, times in self.phase_times.items() if times}
+
+    def toggle_capture(self):
+        """Start a cProfile capture, or stop it and save it to a file.
+            When the game world runs on its own thread, that thread is
+             profiled too, and both are saved together.
+        """
+        if self.capture is None:
+            self.capture = cProfile.Profile()
+            self.capture.enable()
+            return
+
+        capture = self.capture
+        capture.disable()
+        self.capture = None
+        stats = pstats.Stats(capture)
+        threads = "main thread"
+
+        # Wait for the simulation thread to finish its tick and hand over
+        #  its capture.
+        simulation = self.ai_game.simulation
+        if simulation and simulation.is_alive():
+            try:
+                stats.add(simulation.captures.get(timeout=1.0))
+                threads = "main and simulation threads"
+            except queue.Empty:
+                pass
+
+        filepath = time.strftime("profile_%Y%m%d_%H%M%S.prof")
+        stats.dump_stats(filepath)
+        stats.sort_stats("cumulative").print_stats(15)
+        print(f"Profile of the {threads} written to {filepath}")
+
+    def _prep_hud(self):
+        """Turn the latest measurements into rendered lines of text."""
+        frame_times = self.frame_times
+        mean_frame = sum(frame_times) / len(frame_times)
+        frame_p50, frame_p99, _ = percentiles(frame_times)
+        worst = max(self.worst_frames)
+
+        lines = [
+            f"FPS {1 / mean_frame:.0f}  frame p50 {frame_p50:.2f} "
+            f"p99 {frame_p99:.2f} ms",
+            f"worst {worst[0] * 1000:.1f} ms (frame {worst[1]}, {worst[2]})",
+            f"aliens {len(self.ai_game.aliens)}  bullets {len(self.ai_game.bullets)}",
+        ]
+        latency = self.ai_game.controls.latency()
+        if latency:
+            lines.append(f"input latency p50 {latency[0]:.1f} "
+                         f"p99 {latency[1]:.1f} ms")
+        lines.append("phase p50 / p99 / max ms")
+        for name, (p50, p99, maximum) in self.summary().items():
+            lines.append(f"{name} {p50:.3f} / {p99:.3f} / {maximum:.3f}")
+        if self.capture is not None:
+            lines.append("cProfile capturing...")
+
+        self.hud_images = [self.font.render(line, True, self.text_color,
+                                            self.settings.bg_color)
+                           for line in lines]
+
+    def draw_hud(self):
+        """Draw the overlay below the ships left, and return the rects drawn on."""
+        if not self.frame_times:
+            return []
+
+        # Only render the text a few times a second, to keep the cost down.
+        now = time.perf_counter()
+        if now >= self.next_hud_update:
+            self._prep_hud()
+            self.next_hud_update = now + self.settings.profiler_hud_interval
+
+        rects = []
+        top = self.ai_game.sb.high_score_rect.bottom + 60
+        for image in self.hud_images:
+            rects.append(self.screen.blit(image, (10, top)))
+            top += image.get_height()
+        return rects
+
+
+class StartupTimer:
+    """A class to time each step of starting the game, up to the first frame."""
+
+    def __init__(self):
+        """Start timing from now."""
+        self.start = time.perf_counter()
+        self.last_mark = self.start
+
+        # Key: name of a step. Value: time it took, in seconds.
+        self.steps = {}
+
+    def mark(self, name):
+        """Record the time since the last mark as step name."""
+        now = time.perf_counter()
+        self.steps[name] = now - self.last_mark
+        self.last_mark = now
+
+    def total(self):
+        """Return the time from the start to the last mark, in seconds."""
+        return self.last_mark - self.start
+
+    def report(self):
+        """Return the time of each step as lines of text."""
+        lines = [f"{name:14} {seconds * 1000:7.2f} ms"
+                 for name, seconds in self.steps.items()]
+        lines.append(f"{'total':14} {self.total() * 1000:7.2f} ms from start to first frame")
+        return "\n".join(lines)
@@ -0,0 +1,46 @@
+import pygame
+
+class DirtyRenderer:
+    """A class to push only the parts of the screen that changed.
+        Everything drawn last frame is painted over with the background,
+         the new frame is drawn, and only the old and new areas are updated.
+    """
+
+    def __init__(self, ai_game):
+        """Initialise the renderer so the first frame is drawn in full."""
+        self.screen = ai_game.screen
+        self.bg_color = ai_game.settings.bg_color
+
+        # Areas of the screen drawn on in the last frame.
+        self.previous_rects = []
+        self.was_idle = None
+        self.invalidate()
+
+    def invalidate(self):
+        """Draw the whole screen again on the next frame."""
+        self.full_redraw = True
+
+    def render(self, draw_frame, idle):
+        """Draw a frame by calling draw_frame, which returns the rects it drew on.
+            When idle is True nothing on screen moves, so a frame is only
+             drawn when the game has just become idle.
+        """
+        if idle and self.was_idle and not self.full_redraw:
+            return
+        if idle != self.was_idle:
+            self.invalidate()
+        self.was_idle = idle
+
+        if self.full_redraw:
+            self.screen.fill(self.bg_color)
+            rects = draw_frame()
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            # Paint over the last frame, then update the old and new areas.
+            for rect in self.previous_rects:
+                self.screen.fill(self.bg_color, rect)
+            rects = draw_frame()
+            pygame.display.update(self.previous_rects + rects)
+
+        self.previous_rects = rects
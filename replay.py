@@ -0,0 +1,201 @@
+# Record the input of a game, and replay it exactly.
+#  To replay a recording as fast as possible: python replay.py FILE
+#  Add --render to watch it in a window instead.
+#  A game played with a wave file replays with the same wave file. Use --waves
+#   if it has moved since the game was recorded.
+
+import argparse
+import hashlib
+import struct
+import time
+
+import pygame
+
+from settings import Settings
+
+# Every recording starts with a header and the path of the wave file,
+#  followed by one record per input.
+#  Header: magic, version, seed, tick rate, screen width and height, flags,
+#   level new games start on, SHA-256 of the wave file (all zeros without one),
+#   length of the wave file's path in bytes.
+#  Record: tick, kind of input, key.
+HEADER = struct.Struct("<4sBQHHHBH32sH")
+RECORD = struct.Struct("<IBI")
+MAGIC = b"AIRP"
+VERSION = 3
+NO_WAVES = bytes(32)
+
+# Kinds of input.
+KEYDOWN = 1
+KEYUP = 2
+START = 3
+END = 4
+
+# Flags describing settings that change how the game plays.
+SKIP_PAUSES = 1
+
+# Keys that don't play the game: quitting, the profiler, and saving and loading.
+#  They are never recorded or replayed, so a replay can't touch the save file.
+UNRECORDED_KEYS = {pygame.K_q, pygame.K_F2, pygame.K_F3, pygame.K_F5, pygame.K_F9}
+
+
+class Recorder:
+    """A class to write the input of every tick to a recording file."""
+
+    def __init__(self, ai_game, filepath):
+        """Open the recording file and write the header."""
+        self.ai_game = ai_game
+        settings = ai_game.settings
+        flags = SKIP_PAUSES if settings.skip_pauses else 0
+
+        # The waves change every level, so the recording has to name them.
+        digest, wave_file = NO_WAVES, b""
+        if ai_game.waves:
+            digest = ai_game.waves.digest
+            wave_file = settings.wave_file.encode("utf-8")
+
+        self.file = open(filepath, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, settings.seed,
+                                    settings.tick_rate, settings.screen_width,
+                                    settings.screen_height, flags,
+                                    settings.start_level, digest,
+                                    len(wave_file)))
+        self.file.write(wave_file)
+
+    def record_event(self, event):
+        """Record a key press or key release on the current tick."""
+        if event.key in UNRECORDED_KEYS:
+            return
+        kind = KEYDOWN if event.type == pygame.KEYDOWN else KEYUP
+        self._write(kind, event.key)
+
+    def record_start(self):
+        """Record the Play button being clicked on the current tick."""
+        self._write(START)
+
+    def _write(self, kind, key=0):
+        """Write one record for the current tick."""
+        self.file.write(RECORD.pack(self.ai_game.ticks, kind, key))
+
+    def close(self):
+        """Mark the tick the recording ends on, and close the file."""
+        if not self.file.closed:
+            self._write(END)
+            self.file.close()
+
+
+def read_recording(filepath):
+    """Read a recording file.
+        Return the header as a dictionary, and a list of (tick, kind, key) records.
+    """
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError(f"{filepath} is not a version {VERSION} recording.")
+    (magic, version, seed, tick_rate, width, height, flags, start_level,
+     wave_digest, wave_file_length) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{filepath} is not a version {VERSION} recording.")
+    offset = HEADER.size
+    wave_file = data[offset:offset + wave_file_length].decode("utf-8")
+    offset += wave_file_length
+
+    header = {
+        "seed": seed,
+        "tick_rate": tick_rate,
+        "screen_width": width,
+        "screen_height": height,
+        "skip_pauses": bool(flags & SKIP_PAUSES),
+        "start_level": start_level,
+        "wave_file": wave_file or None,
+        "wave_digest": wave_digest if wave_file else None,
+    }
+    records = list(RECORD.iter_unpack(data[offset:]))
+    return header, records
+
+
+def replay(filepath, render=False, wave_file=None):
+    """Play back a recording, and return the game in its final state.
+        Without render, the game runs headless as fast as it can.
+        A game recorded with a wave file is played with the same one, from
+         wave_file if given. Raise ValueError if it has changed since.
+    """
+    # Import here, as alien_invasion imports this module.
+    from alien_invasion import AlienInvasion
+
+    header, records = read_recording(filepath)
+
+    # Check the waves are the ones the game was played with.
+    if header["wave_file"]:
+        wave_file = wave_file or header["wave_file"]
+        with open(wave_file, "rb") as f:
+            if hashlib.sha256(f.read()).digest() != header["wave_digest"]:
+                raise ValueError(f"{wave_file} is not the wave file "
+                                 f"{filepath} was recorded with.")
+    else:
+        wave_file = None
+
+    # Set the game up exactly like the recorded one.
+    settings = Settings()
+    settings.headless = not render
+    settings.fullscreen = False
+    settings.sound_enabled = False
+    settings.save_scores = False
+    settings.seed = header["seed"]
+    settings.tick_rate = header["tick_rate"]
+    settings.screen_width = header["screen_width"]
+    settings.screen_height = header["screen_height"]
+    settings.skip_pauses = header["skip_pauses"]
+    settings.start_level = header["start_level"]
+    settings.wave_file = wave_file
+    ai_game = AlienInvasion(settings)
+
+    tick_time = 1 / settings.tick_rate
+    records = iter(records)
+    record = next(records, None)
+    while record is not None:
+        tick, kind, key = record
+
+        # Run the game up to the tick of the next input.
+        while ai_game.ticks < tick:
+            ai_game.controls.apply()
+            ai_game._tick(tick_time)
+            if render:
+                ai_game._update_screen()
+                pygame.event.pump()
+
+        # Feed the input back in the same way the keyboard would.
+        if kind == END:
+            break
+        elif kind == START:
+            if not ai_game.stats.game_active:
+                ai_game._start_game()
+        elif key not in UNRECORDED_KEYS:
+            event = pygame.event.Event(
+                pygame.KEYDOWN if kind == KEYDOWN else pygame.KEYUP, key=key)
+            if kind == KEYDOWN:
+                ai_game._check_keydown_events(event)
+            else:
+                ai_game._check_keyup_events(event)
+        record = next(records, None)
+
+    return ai_game
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay an Alien Invasion recording.")
+    parser.add_argument("filepath", help="recording made with alien_invasion.py --record")
+    parser.add_argument("--render", action="store_true", help="show the replay in a window")
+    parser.add_argument("--waves", metavar="FILE",
+                        help="the wave file the game was played with, if it has moved")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    ai_game = replay(args.filepath, render=args.render, wave_file=args.waves)
+    elapsed = time.perf_counter() - start_time
+
+    stats = ai_game.stats
+    print(f"Score {stats.score:,}, level {stats.level}, ships left {stats.ships_left}")
+    print(f"{ai_game.ticks:,} ticks in {elapsed:.2f} s "
+          f"({ai_game.ticks / elapsed:,.0f} ticks per second)")
@@ -0,0 +1,178 @@
+# Save the whole state of a game to a compact binary snapshot, and load it back.
+#  Numbers are packed with struct, and the alien and bullet arrays are stored
+#   as raw bytes, so saving and loading are quick and the format is versioned.
+
+import struct
+
+import numpy as np
+
+from collision import GridIndex
+from formation import Formation
+from game_state import GameState
+
+MAGIC = b"AISV"
+VERSION = 3
+
+# Header: magic, version, screen size, tick, tick the game started on, score,
+#  level, ships left, game active, game state, seconds left in it and its length,
+#  fleet direction, ship x and previous x, ship moving left and right.
+HEADER = struct.Struct("<4sBHHQQqHB?BddbddBB")
+# Fleet: number of aliens, is it a grid, columns, rows, spacing x and y.
+#  Followed by x, y, previous x, alive, hit points and points of every alien.
+FLEET = struct.Struct("<I?IIII")
+# Bullets: number of slots.
+#  Followed by x, y, previous y, alive and firing number of every slot.
+BULLETS = struct.Struct("<I")
+
+STATES = [GameState.PLAYING, GameState.LEVEL_TRANSITION, GameState.RESPAWN,
+          GameState.GAME_OVER]
+
+
+def save_game(ai_game):
+    """Return the state of ai_game as bytes."""
+    settings = ai_game.settings
+    stats = ai_game.stats
+    state = ai_game.state
+    ship = ai_game.ship
+    aliens = ai_game.aliens
+    bullets = ai_game.bullets
+
+    parts = [HEADER.pack(
+        MAGIC, VERSION, settings.screen_width, settings.screen_height,
+        ai_game.ticks, getattr(ai_game, "game_start_tick", 0), stats.score,
+        stats.level, stats.ships_left, stats.game_active,
+        STATES.index(state.name), state.time_left, state.duration,
+        settings.fleet_direction, ship.x, ship.previous_x,
+        ship.moving_left, ship.moving_right)]
+
+    # The grid shape is kept, so bullet hits are found the same way after loading.
+    index = aliens.index
+    if isinstance(index, GridIndex):
+        parts.append(FLEET.pack(len(aliens.x), True, index.columns, index.rows,
+                                index.spacing_x, index.spacing_y))
+    else:
+        parts.append(FLEET.pack(len(aliens.x), False, 0, 0, 0, 0))
+    parts += [aliens.x.astype("<f8").tobytes(), aliens.y.astype("<f8").tobytes(),
+              aliens.previous_x.astype("<f8").tobytes(),
+              aliens.alive.astype("u1").tobytes(),
+              aliens.hit_points.astype("<u2").tobytes(),
+              aliens.points.astype("<u2").tobytes()]
+
+    parts.append(BULLETS.pack(bullets.capacity))
+    parts += [bullets.x.astype("<i4").tobytes(), bullets.y.astype("<f8").tobytes(),
+              bullets.previous_y.astype("<f8").tobytes(),
+              bullets.alive.astype("u1").tobytes(),
+              bullets.fired.astype("<i8").tobytes()]
+    return b"".join(parts)
+
+
+def load_game(ai_game, data):
+    """Put ai_game into the state saved in data.
+        The game must have the same screen size as the saved one.
+        Raise ValueError if data isn't a whole saved game. The game is only
+         changed once all of data has been read, so it is never half loaded.
+    """
+    settings = ai_game.settings
+    try:
+        (magic, version, width, height, ticks, game_start_tick, score, level,
+         ships_left, game_active, state_number, time_left, duration,
+         fleet_direction, ship_x, ship_previous_x, moving_left,
+         moving_right) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} saved game.")
+        if (width, height) != (settings.screen_width, settings.screen_height):
+            raise ValueError(f"The game was saved on a {width}x{height} screen.")
+        if level < 1:
+            raise ValueError(f"Levels start at 1, not {level}.")
+        if state_number >= len(STATES):
+            raise ValueError(f"Unknown game state {state_number}.")
+        offset = HEADER.size
+
+        # The fleet.
+        number_aliens, is_grid, columns, rows, spacing_x, spacing_y = (
+            FLEET.unpack_from(data, offset))
+        offset += FLEET.size
+        x, offset = _read_array(data, offset, "<f8", number_aliens)
+        y, offset = _read_array(data, offset, "<f8", number_aliens)
+        previous_x, offset = _read_array(data, offset, "<f8", number_aliens)
+        alive, offset = _read_array(data, offset, "u1", number_aliens)
+        hit_points, offset = _read_array(data, offset, "<u2", number_aliens)
+        points, offset = _read_array(data, offset, "<u2", number_aliens)
+
+        # The bullets.
+        capacity = BULLETS.unpack_from(data, offset)[0]
+        offset += BULLETS.size
+        bullet_x, offset = _read_array(data, offset, "<i4", capacity)
+        bullet_y, offset = _read_array(data, offset, "<f8", capacity)
+        bullet_previous_y, offset = _read_array(data, offset, "<f8", capacity)
+        bullet_alive, offset = _read_array(data, offset, "u1", capacity)
+        bullet_fired, offset = _read_array(data, offset, "<i8", capacity)
+    except struct.error:
+        raise ValueError("The saved game is cut short.") from None
+    if offset != len(data):
+        raise ValueError("The saved game has extra data at the end.")
+
+    # Game progress, speeds and pauses.
+    ai_game.ticks = ticks
+    ai_game.game_start_tick = game_start_tick
+    stats = ai_game.stats
+    stats.score, stats.level, stats.ships_left = score, level, ships_left
+    stats.game_active = game_active
+    settings.set_level(level)
+    ai_game._apply_wave_speed(level)
+    settings.fleet_direction = fleet_direction
+    ai_game.state.name = STATES[state_number]
+    ai_game.state.time_left = time_left
+    ai_game.state.duration = duration
+
+    ship = ai_game.ship
+    ship.x, ship.previous_x = ship_x, ship_previous_x
+    ship.rect.x = ship.x
+    ship.moving_left, ship.moving_right = bool(moving_left), bool(moving_right)
+
+    aliens = ai_game.aliens
+    grid = (columns, rows, spacing_x, spacing_y) if is_grid else None
+    aliens.spawn(Formation(x, y, aliens.width, aliens.height, grid,
+                           hit_points, points))
+    aliens.previous_x[:] = previous_x
+    aliens.kill(alive == 0)
+
+    bullets = ai_game.bullets
+    if capacity != bullets.capacity:
+        settings.bullets_allowed = capacity
+        bullets.empty()
+    bullets.x[:] = bullet_x
+    bullets.y[:] = bullet_y
+    bullets.previous_y[:] = bullet_previous_y
+    bullets.alive[:] = bullet_alive != 0
+    bullets.fired[:] = bullet_fired
+    bullets.fire_count = int(bullet_fired.max()) + 1 if capacity else 0
+    bullets.number_alive = int(np.count_nonzero(bullets.alive))
+
+    # Show the loaded game.
+    ai_game.sb.prep_images()
+    if not ai_game.settings.headless:
+        ai_game.renderer.invalidate()
+
+
+def _read_array(data, offset, dtype, count):
+    """Read count numbers of dtype from data at offset.
+        Return them and the offset just after them.
+        Raise struct.error if data ends before them.
+    """
+    if offset + np.dtype(dtype).itemsize * count > len(data):
+        raise struct.error("Not enough data.")
+    array = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+    return array, offset + array.nbytes
+
+
+def save_to_file(ai_game, filepath):
+    """Save the state of ai_game to a file."""
+    with open(filepath, "wb") as f:
+        f.write(save_game(ai_game))
+
+
+def load_from_file(ai_game, filepath):
+    """Load the state of ai_game from a file."""
+    with open(filepath, "rb") as f:
+        load_game(ai_game, f.read())
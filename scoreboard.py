@@ -1,4 +1,5 @@
-import pygame.font
+import math
+
 from pygame.sprite import Group
 
 from ship import Ship
@@ -13,18 +14,20 @@ class Scoreboard:
         self.screen_rect = self.screen.get_rect()
         self.settings = ai_game.settings
         self.stats = ai_game.stats
+        self.text_cache = ai_game.text_cache
 
         # Font settings for scoring information 
         self.text_color = (251, 206, 48)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.font(48)
 
         # Prepare the images on the screen.
+        #  They are rendered when the first frame is drawn.
         self.prep_images()
      
 
     def prep_images(self):
-        """Prepare the images for the score, high score, level and ships 
-            remaining.
+        """Mark the images for the score, high score, level and ships 
+            remaining to be rendered again.
         """
         self.prep_score()
         self.prep_high_score()
@@ -32,11 +35,19 @@ class Scoreboard:
         self.prep_ships()
 
     def prep_score(self):
+        """Mark the score to be rendered again.
+            However many aliens are hit, it is only rendered once per frame.
+        """
+        self.score_changed = True
+
+    def _render_score(self):
         """Turn the score into a rendered image."""
+        self.score_changed = False
+
         # Create the score as an image.
         rounded_score = round(self.stats.score, -1)
         score_str = f"{rounded_score:,}"
-        self.score_image = self.font.render(score_str, True,
+        self.score_image = self.text_cache.render(self.font, score_str,
             self.text_color, self.settings.bg_color)
 
         # Display the score rectangle at the top right of the screen.
@@ -45,11 +56,17 @@ class Scoreboard:
         self.score_rect.top = 20
     
     def prep_high_score(self):
+        """Mark the high score to be rendered again on the next frame."""
+        self.high_score_changed = True
+
+    def _render_high_score(self):
         """Turn the high score into a rendered image."""
+        self.high_score_changed = False
+
         # Create the score as an image.
         high_score = round(self.stats.high_score, -1)
         high_score_str = f"High score - {high_score:,}"
-        self.high_score_image = self.font.render(high_score_str, True,
+        self.high_score_image = self.text_cache.render(self.font, high_score_str,
             self.text_color, self.settings.bg_color)
 
         # Display the high score rectangle at the top of the screen.
@@ -58,10 +75,16 @@ class Scoreboard:
         self.high_score_rect.top = self.score_rect.top
     
     def prep_level(self):
+        """Mark the level to be rendered again on the next frame."""
+        self.level_changed = True
+
+    def _render_level(self):
         """Turn the level into a rendered image."""
+        self.level_changed = False
+
         # Create the score as an image.
         level_str = f"Lvl {self.stats.level}"
-        self.level_image = self.font.render(level_str, True,
+        self.level_image = self.text_cache.render(self.font, level_str,
             self.text_color, self.settings.bg_color)
 
         # Display the level rectangle below the score.
@@ -70,7 +93,13 @@ class Scoreboard:
         self.level_rect.top = self.score_rect.bottom + 10
 
     def prep_ships(self):
+        """Mark the ships left to be shown again on the next frame."""
+        self.ships_changed = True
+
+    def _render_ships(self):
         """Show how many ships are left."""
+        self.ships_changed = False
+
         # Create an empty group to hold the ship instances.
         self.ships = Group()
 
@@ -83,14 +112,46 @@ class Scoreboard:
             self.ships.add(ship)
         
     def draw_score(self):
-        """Draw score to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.ships.draw(self.screen)
+        """Draw score to the screen, and return the rects that were drawn on."""
+        self._render_changed()
+
+        rects = [
+            self.screen.blit(self.score_image, self.score_rect),
+            self.screen.blit(self.high_score_image, self.high_score_rect),
+            self.screen.blit(self.level_image, self.level_rect),
+        ]
+        rects.extend(self.screen.blits(
+            (ship.image, ship.rect) for ship in self.ships.sprites()))
+        return rects
+
+    def _render_changed(self):
+        """Render the images that changed since the last frame.
+            Rendering only happens here, while drawing, so the game can be
+             updated on another thread without touching any fonts.
+        """
+        if self.score_changed:
+            self._render_score()
+        if self.high_score_changed:
+            self._render_high_score()
+        if self.level_changed:
+            self._render_level()
+        if self.ships_changed:
+            self._render_ships()
 
     def check_high_score(self):
         """Check to see if there is a new high score."""
         if self.stats.score > self.stats.high_score:
             self.stats.high_score = self.stats.score
             self.prep_high_score()
+            self.ai_game.scores.save_high_score(self.stats.high_score)
+
+    def draw_countdown(self, time_left):
+        """Draw the seconds left before play resumes in the centre of the screen.
+            Return the rect that was drawn on.
+        """
+        countdown_str = str(max(1, math.ceil(time_left)))
+        countdown_image = self.text_cache.render(self.font, countdown_str,
+            self.text_color, self.settings.bg_color)
+        countdown_rect = countdown_image.get_rect()
+        countdown_rect.center = self.screen_rect.center
+        return self.screen.blit(countdown_image, countdown_rect)
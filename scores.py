@@ -0,0 +1,151 @@
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+def top_scores(filepath, number=10):
+    """Return the best number games in the score history at filepath,
+        as (score, level, duration, timestamp).
+    """
+    if not os.path.exists(filepath):
+        return []
+    connection = sqlite3.connect(filepath)
+    try:
+        # The index on score means only the top rows are read.
+        return connection.execute(
+            "SELECT score, level, duration, timestamp FROM games "
+            "ORDER BY score DESC LIMIT ?", (number,)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        connection.close()
+
+
+def print_top_scores(filepath, number=10):
+    """Print the best number games in the score history at filepath."""
+    games = top_scores(filepath, number)
+    if not games:
+        print("No games have been played yet.")
+        return
+    print(f"{'':>3} {'Score':>12} {'Level':>5} {'Time':>8}  Played")
+    for place, (score, level, duration, timestamp) in enumerate(games, 1):
+        played = time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+        print(f"{place:>2}. {score:>12,} {level:>5} {duration:>7.0f}s  {played}")
+
+
+class ScoreStore:
+    """A class to save the high score and the history of every game.
+        Saving happens on a background thread, so it never holds up a frame.
+    """
+
+    def __init__(self, ai_game):
+        """Start the thread that saves scores, if scores are to be saved."""
+        self.settings = ai_game.settings
+        self.enabled = self.settings.save_scores and not self.settings.headless
+
+        # Jobs for the background thread. None tells it to stop.
+        self.jobs = queue.Queue()
+
+        # Only the latest high score needs saving, however often it is beaten.
+        self.lock = threading.Lock()
+        self.pending_high_score = None
+
+        if self.enabled:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def read_high_score(self):
+        """Return the saved high score, or 0 if there isn't a valid one."""
+        try:
+            with open(self.settings.high_score_file, 'r') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return 0
+
+    def save_high_score(self, high_score):
+        """Save high_score in the background."""
+        if not self.enabled:
+            return
+        with self.lock:
+            already_queued = self.pending_high_score is not None
+            self.pending_high_score = high_score
+        if not already_queued:
+            self.jobs.put(self._write_high_score)
+
+    def record_game(self, score, level, duration):
+        """Add a finished game to the score history in the background.
+            duration is the length of the game in seconds.
+        """
+        if self.enabled:
+            game = (score, level, duration, time.time())
+            self.jobs.put(lambda: self._insert_game(game))
+
+    def close(self):
+        """Finish saving everything that is queued, and stop the thread."""
+        if self.enabled and self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join()
+
+    def _run(self):
+        """Run saving jobs until told to stop.
+            A job that fails is reported, and the thread carries on with the rest.
+        """
+        # The connection must be used on the thread that made it.
+        self.connection = None
+        try:
+            self.connection = sqlite3.connect(self.settings.score_history_file)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, "
+                "score INTEGER, level INTEGER, duration REAL, timestamp REAL)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC)")
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"Can't open the score history: {e}", file=sys.stderr)
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            try:
+                job()
+            except Exception as e:
+                print(f"Can't save scores: {e}", file=sys.stderr)
+        if self.connection:
+            self.connection.close()
+
+    def _write_high_score(self):
+        """Write the latest high score to a temporary file, then swap it in,
+            so a crash can never leave a half-written file behind.
+        """
+        with self.lock:
+            high_score = self.pending_high_score
+            self.pending_high_score = None
+
+        filepath = os.path.abspath(self.settings.high_score_file)
+        file_descriptor, temp_filepath = tempfile.mkstemp(
+            dir=os.path.dirname(filepath), prefix=".high_score_")
+        try:
+            with os.fdopen(file_descriptor, 'w') as f:
+                f.write(str(high_score))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_filepath, filepath)
+        except OSError:
+            os.remove(temp_filepath)
+            raise
+
+    def _insert_game(self, game):
+        """Add a game to the history, and drop the oldest games past the limit."""
+        if self.connection is None:
+            raise sqlite3.OperationalError("The score history isn't open.")
+        cursor = self.connection.execute(
+            "INSERT INTO games (score, level, duration, timestamp) "
+            "VALUES (?, ?, ?, ?)", game)
+        self.connection.execute(
+            "DELETE FROM games WHERE id <= ?",
+            (cursor.lastrowid - self.settings.score_history_size,))
+        self.connection.commit()
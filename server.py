@@ -0,0 +1,184 @@
+# Run the game on a server, and stream it to players and spectators.
+#  Usage: python server.py [--host 127.0.0.1] [--port 8765]
+#  Then connect with: python client.py [--play]
+
+import argparse
+import asyncio
+
+import network
+from settings import Settings
+from alien_invasion import AlienInvasion
+
+
+class ClientConnection:
+    """A class to hold the messages waiting to be sent to one client."""
+
+    def __init__(self, writer, queue_size):
+        """Initialise an empty queue of messages for the client."""
+        self.writer = writer
+        self.outbox = asyncio.Queue(maxsize=queue_size)
+
+        # A client that missed a snapshot can't use the next delta,
+        #  so it gets a keyframe instead.
+        self.needs_keyframe = True
+
+    def send(self, delta, keyframe):
+        """Queue the latest snapshot without waiting.
+            keyframe is a function that encodes the full snapshot when needed.
+        """
+        if self.outbox.full():
+            # The client is too slow. Drop what it hasn't read yet,
+            #  and start it again from a keyframe.
+            while not self.outbox.empty():
+                self.outbox.get_nowait()
+            self.needs_keyframe = True
+
+        if self.needs_keyframe:
+            self.outbox.put_nowait(keyframe())
+            self.needs_keyframe = False
+        else:
+            self.outbox.put_nowait(delta)
+
+
+class GameServer:
+    """A class to run the game and stream snapshots of it over the network.
+        The game runs at a fixed tick in its own task. Sending to clients
+         happens in a task per client, so slow clients never slow the game.
+    """
+
+    def __init__(self, settings, host, port):
+        """Create the game the server runs."""
+        settings.headless = True
+        self.settings = settings
+        self.host = host
+        self.port = port
+        self.ai_game = AlienInvasion(settings)
+
+        self.clients = set()
+        self.player = None
+
+        # Input from the player: held keys, and keys to act on once.
+        self.held_keys = 0
+        self.pressed_keys = 0
+
+        self.previous_snapshot = None
+
+    async def serve(self):
+        """Accept connections and run the game until cancelled."""
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        async with server:
+            await self._simulate()
+
+    async def _simulate(self):
+        """Run the game at a fixed tick, and send a snapshot every few ticks."""
+        loop = asyncio.get_running_loop()
+        tick_time = 1 / self.settings.tick_rate
+        next_tick = loop.time()
+
+        while True:
+            self.ai_game.step(self._actions())
+            if self.settings.server_autostart and not self.ai_game.stats.game_active:
+                self.ai_game.step({"start"})
+            if self.ai_game.ticks % self.settings.server_snapshot_every == 0:
+                self._broadcast()
+
+            # Wait for the next tick. If the game has fallen far behind,
+            #  carry on from now instead of trying to catch up.
+            next_tick += tick_time
+            delay = next_tick - loop.time()
+            if delay < -self.settings.max_frame_time:
+                next_tick = loop.time()
+            await asyncio.sleep(max(0, delay))
+
+    def _actions(self):
+        """Turn the player's input into actions for one tick."""
+        keys = self.held_keys | self.pressed_keys
+        self.pressed_keys = 0
+
+        actions = set()
+        if keys & network.LEFT:
+            actions.add("left")
+        if keys & network.RIGHT:
+            actions.add("right")
+        if keys & network.FIRE:
+            actions.add("fire")
+        if keys & network.START:
+            actions.add("start")
+        return actions
+
+    def _broadcast(self):
+        """Encode the latest snapshot once, and queue it for every client."""
+        snapshot = network.take_snapshot(self.ai_game)
+        if self.previous_snapshot is None:
+            delta = network.encode_snapshot(snapshot)
+        else:
+            delta = network.encode_snapshot(snapshot, self.previous_snapshot)
+        self.previous_snapshot = snapshot
+
+        keyframe_message = []
+        def keyframe():
+            # Only encode a keyframe if some client needs it, and only once.
+            if not keyframe_message:
+                keyframe_message.append(network.encode_snapshot(snapshot))
+            return keyframe_message[0]
+
+        for client in self.clients:
+            client.send(delta, keyframe)
+
+    async def _handle_client(self, reader, writer):
+        """Serve one client until it disconnects."""
+        client = ClientConnection(writer, self.settings.server_queue_size)
+        sender = None
+        try:
+            role = await reader.readexactly(1)
+            self.clients.add(client)
+            sender = asyncio.create_task(self._send_messages(client))
+
+            # Only one client can play at a time. Everyone else watches.
+            if role == network.PLAYER and self.player is None:
+                self.player = client
+                while True:
+                    keys = (await reader.readexactly(1))[0]
+                    self.held_keys = keys & (network.LEFT | network.RIGHT)
+                    self.pressed_keys |= keys & (network.FIRE | network.START)
+            else:
+                # Wait for the spectator to disconnect.
+                await reader.read()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.discard(client)
+            if self.player is client:
+                self.player = None
+                self.held_keys = 0
+            if sender:
+                sender.cancel()
+            writer.close()
+
+    async def _send_messages(self, client):
+        """Send a client its queued messages, as fast as it will take them."""
+        try:
+            while True:
+                message = await client.outbox.get()
+                client.writer.write(message)
+                await client.writer.drain()
+        except ConnectionError:
+            pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run an Alien Invasion server.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--autostart", action="store_true",
+                        help="start a new game whenever one ends")
+    args = parser.parse_args()
+
+    settings = Settings()
+    settings.fullscreen = False
+    settings.server_autostart = args.autostart
+    print(f"Serving Alien Invasion on {args.host}:{args.port}")
+    try:
+        asyncio.run(GameServer(settings, args.host, args.port).serve())
+    except KeyboardInterrupt:
+        pass
@@ -6,8 +6,14 @@ class Settings:
     def __init__(self):
         """Initialise the game's static settings."""
         # Screen settings
+        #  The width and height are only used when the game isn't fullscreen.
+        self.fullscreen = True
         self.screen_width = 1200
         self.screen_height = 800
+
+        #  Set headless to True to run without a window or sound,
+        #   e.g. to simulate games with AlienInvasion.step().
+        self.headless = False
         self.bg_color = (0, 22, 34)
 
         # Ship settings
@@ -22,36 +28,157 @@ class Settings:
         # Alien settings
         self.fleet_drop_speed = 15
 
+        # Speeds on the first level, in pixels per second, and points per alien.
+        self.starting_ship_speed = 300.0
+        self.starting_bullet_speed = 400.0
+        self.starting_alien_speed = 100.0
+        self.starting_alien_points = 50
+
+        # Level a new game starts on.
+        self.start_level = 1
+
         # How quickly the aliens speed up (multiplier)
         self.speedup_scale = 1.4
 
         # How quickly the value of aliens increases (multiplier).
         self.score_scale = 2.0
 
+        # Score settings
+        #  Set save_scores to False to keep the high score and history untouched.
+        self.save_scores = True
+        self.high_score_file = "high_score.txt"
+        self.score_history_file = "score_history.db"
+        #  Number of past games kept in the history.
+        self.score_history_size = 1000
+
+        #  File the game is saved to with F5, and loaded from with F9.
+        self.save_file = "savegame.bin"
+
+        # Wave settings
+        #  Set wave_file to a wave file (see waves.py) to lay out each level's
+        #   aliens from it, instead of filling the screen with one grid.
+        self.wave_file = None
+        #  File the checked wave file is compiled to, so it is only parsed once.
+        self.wave_cache_file = "wave_cache.bin"
+
+        # Recording settings
+        #  Seed for the random number generator. None picks a new one every game.
+        self.seed = None
+        #  Set record_file to a file path to record every input to it.
+        self.record_file = None
+
+        # Network settings
+        #  A snapshot is sent to clients every server_snapshot_every ticks.
+        self.server_snapshot_every = 6
+        #  Snapshots queued for a client before it counts as too slow.
+        self.server_queue_size = 8
+        #  Set server_autostart to True to start a new game whenever one ends.
+        self.server_autostart = False
+        #  Seconds clients draw behind the latest snapshot, to smooth between them.
+        self.client_interpolation_delay = 0.1
+
+        # Drawing settings
+        #  "full" redraws and flips the whole screen every frame.
+        #  "dirty" updates only the parts of the screen that changed.
+        self.render_mode = "full"
+
+        #  Number of rendered pieces of text to remember.
+        self.text_cache_size = 64
+
+        # Profiler settings
+        #  Frames kept in the rolling history, and number of worst frames kept.
+        self.profiler_history = 300
+        self.profiler_worst_frames = 5
+        #  Seconds between updates of the on-screen overlay.
+        self.profiler_hud_interval = 0.25
+        #  Set startup_report to True to print how long starting up took.
+        self.startup_report = False
+
+        # Timing settings
+        #  The game world is updated tick_rate times a second, whatever the frame rate.
+        self.tick_rate = 120
+        #  Highest number of frames drawn per second. 0 means no limit.
+        self.max_fps = 60
+        #  Smooth out movement between ticks when a frame is drawn.
+        self.interpolate = True
+        #  Longest frame (in seconds) that is simulated at once, 
+        #   so the game doesn't try to catch up after a long stall.
+        self.max_frame_time = 0.25
+        #  Longest time (in seconds) to sleep waiting for input while no game
+        #   is going, before checking again.
+        self.idle_wait_timeout = 0.5
+        #  Set threaded to True to update the game world on its own thread,
+        #   while the main thread draws the latest state of it.
+        self.threaded = False
+
         # Pause settings when alien hits ship
         self.pause_time_level_up = 1
         self.pause_time_ship_lost = 2
+        #  Set skip_pauses to True to go straight on, e.g. in headless runs.
+        self.skip_pauses = False
+
+        # Sound settings
+        #  Set sound_enabled to False to play silently, e.g. without an audio device.
+        #  Key: name of the sound. Value: channel number and sound file.
+        self.sound_enabled = True
+        self.sound_files = {
+            "laser": (1, "sounds/laser.mp3"),
+            "level_up": (2, "sounds/level_up.mp3"),
+            "ship_lost": (3, "sounds/ship_lost.mp3"),
+            "game_over": (4, "sounds/game_over.mp3"),
+        }
 
         # Call the starting speed method to set up the values as attributes. 
         self.starting_speed()
 
-    def starting_speed(self):
+    def starting_speed(self, level=1):
         """Set up the initial settings. 
         These settings will change throughout the game.
+        Speeds are in pixels per second.
         """
-        self.ship_speed = 1.5
-        self.bullet_speed = 2.0
-        self.alien_speed = 0.5
-
-        # Scoring
-        self.alien_points = 50
+        self.set_level(level)
 
         #  fleet_direction of 1 represents right; -1 represents left.
         self.fleet_direction = 1
     
-    def increase_speed(self):
-        """Increase speed and alien points."""
-        self.ship_speed *= self.speedup_scale
-        self.bullet_speed *= self.speedup_scale
-        self.alien_speed *= self.speedup_scale
-        self.alien_points = int(self.alien_points * self.score_scale)
+    def set_level(self, level):
+        """Set the speeds and alien points of level in one step."""
+        (self.ship_speed, self.bullet_speed, self.alien_speed,
+         self.alien_points) = self.level_settings(level)
+        self.level = level
+
+    def level_settings(self, level):
+        """Return (ship speed, bullet speed, alien speed, alien points) for level.
+            The values come from a table that is worked out once,
+             and again only if the starting values or scales change.
+            Raise ValueError if level is below 1.
+        """
+        if level < 1:
+            raise ValueError(f"Levels start at 1, not {level}.")
+        key = (self.starting_ship_speed, self.starting_bullet_speed,
+               self.starting_alien_speed, self.starting_alien_points,
+               self.speedup_scale, self.score_scale)
+        if key != getattr(self, "_progression_key", None):
+            self._progression_key = key
+            self._progression = []
+        self._extend_progression(level)
+        return self._progression[level - 1]
+
+    def _extend_progression(self, level):
+        """Add rows to the progression table until it reaches level."""
+        progression = self._progression
+        while len(progression) < level:
+            number = len(progression)
+            if progression:
+                # Alien points are rounded down on every level.
+                alien_points = int(progression[-1][3] * self.score_scale)
+            else:
+                alien_points = self.starting_alien_points
+
+            # Speeds come straight from the level, instead of being multiplied 
+            #  again and again, so they don't drift.
+            speedup = self.speedup_scale ** number
+            progression.append((self.starting_ship_speed * speedup,
+                                self.starting_bullet_speed * speedup,
+                                self.starting_alien_speed * speedup,
+                                alien_points))
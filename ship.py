@@ -1,4 +1,5 @@
-import pygame
+import copy
+
 from pygame.sprite import Sprite
 
 class Ship(Sprite):
@@ -20,7 +21,7 @@ class Ship(Sprite):
 
         # Load an image of a rocket ship. 
         # Then get the rectangle (rect) of the image.
-        self.image = pygame.image.load("images/ship_compressed.bmp")
+        self.image = ai_game.assets.image("images/ship_compressed.bmp")
         self.rect = self.image.get_rect()
 
         # Start each new ship at the bottom center of the screen.
@@ -29,27 +30,49 @@ class Ship(Sprite):
         # Convert the ship's horizontal position (self.rect.x) into decimal values.
         self.x = float(self.rect.x)
 
+        # Remember where the ship was on the previous tick,
+        #  so it can be drawn smoothly between ticks.
+        self.previous_x = self.x
+
         # Movement flag 
         # The default is False, which means the ship is not moving.
         self.moving_right = False
         self.moving_left = False
 
-    def update(self):
-        """Update the ship's position based on movement flags."""
+    def update(self, dt):
+        """Update the ship's position based on movement flags.
+            dt is the length of the tick in seconds.
+        """
+        self.previous_x = self.x
+
         # Update the ship's x value, not the rect.
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.ship_speed
+            self.x += self.settings.ship_speed * dt
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.ship_speed
+            self.x -= self.settings.ship_speed * dt
 
         # Update rect object from self.x
         self.rect.x = self.x
 
-    def blitme(self):
-        """Draw the ship to the screen at the position specified by self.rect"""
-        self.screen.blit(self.image, self.rect)
+    def blitme(self, alpha=1.0):
+        """Draw the ship to the screen at the position specified by self.rect.
+            alpha is how far the frame is between the previous tick and this one.
+             Return the rect that was drawn on.
+        """
+        if self.settings.interpolate:
+            x = self.previous_x + (self.x - self.previous_x) * alpha
+            return self.screen.blit(self.image, (x, self.rect.y))
+        else:
+            return self.screen.blit(self.image, self.rect)
+
+    def snapshot(self):
+        """Return a copy of the ship that can be drawn while this one moves on."""
+        ship = copy.copy(self)
+        ship.rect = self.rect.copy()
+        return ship
 
     def center_ship(self):
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
-        self.x = float(self.rect.x)
\ No newline at end of file
+        self.x = float(self.rect.x)
+        self.previous_x = self.x
\ No newline at end of file
@@ -0,0 +1,106 @@
+import cProfile
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import pygame
+
+from controls import WAKE_UP
+
+# Everything needed to draw one frame of the game.
+#  published is the time.perf_counter() time the world was taken at.
+World = namedtuple("World", ["ship", "aliens", "bullets", "game_active",
+                             "paused", "time_left", "published"])
+
+def take_world(ai_game, frozen=True):
+    """Return a World holding the game as it is now.
+        A frozen world holds copies that are never changed afterwards,
+         so it can be drawn on one thread while the game moves on in another.
+        Without frozen, the world shares the game's own objects.
+    """
+    ship, aliens, bullets = ai_game.ship, ai_game.aliens, ai_game.bullets
+    if frozen:
+        ship, aliens, bullets = (ship.snapshot(), aliens.snapshot(),
+                                 bullets.snapshot())
+    return World(ship, aliens, bullets, ai_game.stats.game_active,
+                 ai_game.state.is_paused(), ai_game.state.time_left,
+                 time.perf_counter())
+
+class SimulationThread(threading.Thread):
+    """A thread to move the game world forward in fixed ticks.
+        The main thread hands over events through a queue and draws the
+         latest world. After every tick a new frozen World replaces the old one
+         in a single assignment, so the main thread never sees half a tick.
+    """
+
+    def __init__(self, ai_game):
+        """Initialise the thread, and publish the world as it is now."""
+        super().__init__(name="simulation", daemon=True)
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.tick_time = 1 / self.settings.tick_rate
+
+        # Events from the main thread, handled at the start of the next tick.
+        self.events = queue.Queue()
+
+        # The latest world, for the main thread to draw.
+        self.world = take_world(ai_game)
+
+        # Set to ask the thread to finish.
+        self.stopping = threading.Event()
+
+        # A cProfile capture only sees the thread it runs on, so this thread
+        #  runs its own while the main thread is capturing, and hands it back.
+        self.capture = None
+        self.captures = queue.Queue()
+
+    def run(self):
+        """Run ticks at tick_rate until the thread is stopped."""
+        next_tick = time.perf_counter()
+
+        while not self.stopping.is_set():
+            # Handle every event that came in since the last tick.
+            while True:
+                try:
+                    event = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                self.ai_game._handle_event(event)
+            self._follow_capture()
+
+            self.ai_game.controls.apply()
+            self.ai_game._tick(self.tick_time)
+            was_active = self.world.game_active
+            self.world = take_world(self.ai_game)
+
+            # The main thread waits for input while no game is going,
+            #  so wake it up to draw the game that just started or ended.
+            if self.world.game_active != was_active:
+                pygame.event.post(pygame.event.Event(WAKE_UP))
+
+            # Sleep until the next tick is due.
+            next_tick += self.tick_time
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self.stopping.wait(delay)
+            elif -delay > self.settings.max_frame_time:
+                # Don't try to catch up after a long stall.
+                next_tick = time.perf_counter()
+
+    def _follow_capture(self):
+        """Start or stop profiling this thread, along with the main thread."""
+        capturing = self.ai_game.profiler.capture is not None
+        if capturing and self.capture is None:
+            self.capture = cProfile.Profile()
+            self.capture.enable()
+        elif not capturing and self.capture is not None:
+            self.capture.disable()
+            self.captures.put(self.capture)
+            self.capture = None
+
+    def stop(self):
+        """Ask the thread to finish, and wait until it has."""
+        self.stopping.set()
+        if self.is_alive() and self is not threading.current_thread():
+            self.join()
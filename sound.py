@@ -0,0 +1,54 @@
+import pygame
+
+class SoundBank:
+    """A class to load the game's sounds once and play them by name."""
+
+    def __init__(self, ai_game):
+        """Initialise an empty bank. 
+            The mixer is only started, and the sounds decoded, by load().
+        """
+        self.settings = ai_game.settings
+
+        # Key: name of the sound. Value: decoded sound and its own channel.
+        self.sounds = {}
+        self.channels = {}
+        self.loaded = False
+
+        # Fall back to a silent bank if sound is turned off.
+        self.enabled = self.settings.sound_enabled and not self.settings.headless
+
+    def load(self):
+        """Initialise the mixer and decode every sound, the first time only.
+            Starting the audio device is slow, so it is left until a game starts.
+        """
+        if self.loaded or not self.enabled:
+            return
+        self.loaded = True
+
+        # Fall back to a silent bank if there is no audio device to play on.
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error:
+            self.enabled = False
+            return
+
+        self._load_sounds()
+
+    def _load_sounds(self):
+        """Decode every sound and reserve a channel for each of them."""
+        # Reserve the channels so no other sound can steal them.
+        highest_channel = max(channel_number for channel_number, _
+                              in self.settings.sound_files.values())
+        if pygame.mixer.get_num_channels() <= highest_channel:
+            pygame.mixer.set_num_channels(highest_channel + 1)
+        pygame.mixer.set_reserved(highest_channel + 1)
+
+        for name, (channel_number, filepath) in self.settings.sound_files.items():
+            self.sounds[name] = pygame.mixer.Sound(filepath)
+            self.channels[name] = pygame.mixer.Channel(channel_number)
+
+    def play(self, name):
+        """Play the sound called name on its own channel."""
+        if self.enabled and self.loaded:
+            self.channels[name].play(self.sounds[name])
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+# Run without a window or sound, from the folder the images and sounds are in.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from settings import Settings
+from alien_invasion import AlienInvasion
+
+
+@pytest.fixture
+def make_game():
+    """Return a function that makes a headless game with a fixed seed,
+        that leaves the high score and saved game files alone.
+    """
+    def make_game(seed=1, **overrides):
+        settings = Settings()
+        settings.headless = True
+        settings.skip_pauses = True
+        settings.save_scores = False
+        settings.seed = seed
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        return AlienInvasion(settings)
+    return make_game
@@ -0,0 +1,98 @@
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from formation import Formation, grid_formation
+
+
+def _sprite(left, top, width, height):
+    """Return a sprite with a rect, like the old Alien and Bullet sprites."""
+    sprite = pygame.sprite.Sprite()
+    sprite.rect = pygame.Rect(left, top, width, height)
+    return sprite
+
+
+def groupcollide_collisions(fleet, bullets):
+    """Find the hits the way the sprite version of the game did, with the
+        bullets added to their group in the order they were fired.
+        Return a dictionary like Fleet.collide_bullets().
+    """
+    aliens = pygame.sprite.Group()
+    alien_index = {}
+    for index, left, top in zip(np.flatnonzero(fleet.alive).tolist(),
+                                fleet.lefts()[fleet.alive].tolist(),
+                                fleet.tops()[fleet.alive].tolist()):
+        sprite = _sprite(left, top, fleet.width, fleet.height)
+        alien_index[sprite] = index
+        aliens.add(sprite)
+
+    group = pygame.sprite.Group()
+    bullet_slot = {}
+    slots = np.flatnonzero(bullets.alive)
+    for slot in slots[np.argsort(bullets.fired[slots])].tolist():
+        sprite = _sprite(int(bullets.x[slot]), int(np.floor(bullets.y[slot] + 0.5)),
+                         bullets.width, bullets.height)
+        bullet_slot[sprite] = slot
+        group.add(sprite)
+
+    collisions = pygame.sprite.groupcollide(group, aliens, True, True)
+    return {bullet_slot[bullet]: [alien_index[alien] for alien in hit]
+            for bullet, hit in collisions.items()}
+
+
+def fire_bullets(ai_game, rng, lefts, tops):
+    """Fill the bullet pool with bullets between lefts and tops, killing some
+        and firing again, so the slots end up out of firing order.
+    """
+    bullets = ai_game.bullets
+    for _ in range(3):
+        while bullets.fire():
+            pass
+        # Spread the bullets over the area of the fleet.
+        for slot in np.flatnonzero(bullets.alive).tolist():
+            bullets.x[slot] = rng.randint(*lefts)
+            bullets.y[slot] = rng.uniform(*tops)
+        bullets.kill([slot for slot in range(bullets.capacity)
+                      if rng.random() < 0.5])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_collide_bullets_matches_groupcollide_on_random_layouts(make_game, seed):
+    rng = random.Random(seed)
+    ai_game = make_game(bullets_allowed=60)
+    fleet = ai_game.aliens
+
+    # Aliens anywhere in an area, overlapping now and then.
+    number = rng.randint(1, 60)
+    fleet.spawn(Formation([rng.uniform(0, 500) for _ in range(number)],
+                          [rng.uniform(0, 300) for _ in range(number)],
+                          fleet.width, fleet.height))
+    fleet.kill([index for index in range(number) if rng.random() < 0.2])
+    fire_bullets(ai_game, rng, (-10, 560), (-30, 360))
+
+    expected = groupcollide_collisions(fleet, ai_game.bullets)
+    collisions = fleet.collide_bullets(ai_game.bullets)
+    assert collisions == expected
+    assert list(collisions) == list(expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_collide_bullets_matches_groupcollide_on_the_grid(make_game, seed):
+    rng = random.Random(seed)
+    ai_game = make_game(bullets_allowed=100)
+    fleet = ai_game.aliens
+    settings = ai_game.settings
+
+    fleet.spawn(grid_formation(settings.screen_width, settings.screen_height,
+                               fleet.width, fleet.height,
+                               ai_game.ship.rect.height))
+    # Move the fleet off whole pixels, like it is in the middle of a level.
+    fleet.x += rng.uniform(0, 100)
+    fleet.y += rng.choice([0, 15, 30])
+    fire_bullets(ai_game, rng, (0, settings.screen_width),
+                 (0, settings.screen_height // 2))
+
+    expected = groupcollide_collisions(fleet, ai_game.bullets)
+    assert fleet.collide_bullets(ai_game.bullets) == expected
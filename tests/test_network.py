@@ -0,0 +1,27 @@
+from network import LENGTH, decode_snapshot, encode_snapshot, take_snapshot
+from test_replay import play_random_game
+
+
+def test_deltas_rebuild_every_snapshot(make_game):
+    ai_game = make_game(seed=3)
+    previous = None
+    client_snapshot = None
+    delta_bytes = keyframe_bytes = 0
+
+    for _ in range(60):
+        play_random_game(ai_game, 25, seed=ai_game.ticks)
+        snapshot = take_snapshot(ai_game)
+
+        # The client only ever sees the messages, and the snapshot before.
+        message = encode_snapshot(snapshot, previous)
+        assert LENGTH.unpack_from(message)[0] == len(message) - LENGTH.size
+        client_snapshot = decode_snapshot(message[LENGTH.size:], client_snapshot)
+        assert client_snapshot == snapshot
+
+        if previous is not None:
+            delta_bytes += len(message)
+            keyframe_bytes += len(encode_snapshot(snapshot))
+        previous = snapshot
+
+    # Sending only what changed is what deltas are for.
+    assert delta_bytes < keyframe_bytes / 2
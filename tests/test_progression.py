@@ -0,0 +1,54 @@
+import pytest
+
+from settings import Settings
+
+
+def baseline_levels(settings, levels):
+    """Return (ship speed, bullet speed, alien speed, alien points) of each level,
+        worked out one level at a time like Settings.increase_speed() used to.
+    """
+    ship_speed = settings.starting_ship_speed
+    bullet_speed = settings.starting_bullet_speed
+    alien_speed = settings.starting_alien_speed
+    alien_points = settings.starting_alien_points
+
+    rows = []
+    for _ in range(levels):
+        rows.append((ship_speed, bullet_speed, alien_speed, alien_points))
+        ship_speed *= settings.speedup_scale
+        bullet_speed *= settings.speedup_scale
+        alien_speed *= settings.speedup_scale
+        alien_points = int(alien_points * settings.score_scale)
+    return rows
+
+
+@pytest.mark.parametrize("score_scale", [1.1, 1.3, 1.4, 1.5, 1.7, 2.0, 2.5])
+@pytest.mark.parametrize("speedup_scale", [1.1, 1.4])
+def test_progression_matches_increase_speed(score_scale, speedup_scale):
+    settings = Settings()
+    settings.score_scale = score_scale
+    settings.speedup_scale = speedup_scale
+
+    for level, expected in enumerate(baseline_levels(settings, 30), 1):
+        ship_speed, bullet_speed, alien_speed, alien_points = (
+            settings.level_settings(level))
+        # Points are whole numbers, so they must match exactly.
+        assert alien_points == expected[3], level
+        # Speeds are worked out from the level, not multiplied again and again,
+        #  so they can only differ by rounding.
+        assert (ship_speed, bullet_speed, alien_speed) == pytest.approx(
+            expected[:3], rel=1e-12)
+
+
+def test_progression_follows_changed_settings():
+    settings = Settings()
+    settings.level_settings(5)
+    settings.score_scale = 1.4
+    assert [settings.level_settings(level)[3] for level in range(1, 5)] == [
+        50, 70, 98, 137]
+
+
+@pytest.mark.parametrize("level", [0, -1])
+def test_levels_below_one_are_rejected(level):
+    with pytest.raises(ValueError):
+        Settings().level_settings(level)
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pygame
+
+from replay import read_recording, replay
+
+
+def play_random_game(ai_game, ticks, seed):
+    """Play ticks ticks with step(), holding random arrow keys and firing
+        now and then, and starting a new game whenever one ends.
+    """
+    rng = random.Random(seed)
+    moves = [(), ("left",), ("right",)]
+    move = ()
+    for tick in range(ticks):
+        if tick % 20 == 0:
+            move = rng.choice(moves)
+        actions = set(move)
+        if rng.random() < 0.3:
+            actions.add("fire")
+        if not ai_game.stats.game_active:
+            actions.add("start")
+        ai_game.step(actions)
+    return ai_game.get_state()
+
+
+def assert_same_state(state, other):
+    """Check two states from get_state() are the same."""
+    for key in ("score", "level", "ships_left", "game_active", "state", "tick",
+                "ship_x"):
+        assert state[key] == other[key], key
+    assert np.array_equal(state["aliens"], other["aliens"])
+    assert np.array_equal(state["bullets"], other["bullets"])
+
+
+def test_replay_reproduces_a_seeded_step_run(make_game, tmp_path):
+    filepath = tmp_path / "game.rec"
+    ai_game = make_game(seed=7, record_file=str(filepath))
+    state = play_random_game(ai_game, 6000, seed=3)
+    ai_game.recorder.close()
+
+    replayed = replay(str(filepath))
+    assert_same_state(replayed.get_state(), state)
+    assert state["score"] > 0
+
+
+def test_replay_reproduces_a_game_with_waves(make_game, tmp_path):
+    filepath = tmp_path / "game.rec"
+    ai_game = make_game(seed=11, record_file=str(filepath),
+                        wave_file="waves.json",
+                        wave_cache_file=str(tmp_path / "wave_cache.bin"))
+    state = play_random_game(ai_game, 4000, seed=5)
+    ai_game.recorder.close()
+
+    header, _ = read_recording(str(filepath))
+    assert header["wave_file"] == "waves.json"
+    assert_same_state(replay(str(filepath)).get_state(), state)
+
+
+def test_recording_leaves_out_save_and_load_keys(make_game, tmp_path):
+    filepath = tmp_path / "game.rec"
+    ai_game = make_game(record_file=str(filepath),
+                        save_file=str(tmp_path / "savegame.bin"))
+    for key in (pygame.K_p, pygame.K_F5, pygame.K_F9, pygame.K_SPACE):
+        ai_game._handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+    ai_game.recorder.close()
+
+    _, records = read_recording(str(filepath))
+    assert [key for _, _, key in records[:-1]] == [pygame.K_p, pygame.K_SPACE]
+    assert not (tmp_path / "savegame.bin").exists()
@@ -0,0 +1,46 @@
+import pytest
+
+import savegame
+from test_replay import assert_same_state, play_random_game
+
+
+def test_savegame_round_trip(make_game):
+    ai_game = make_game(seed=4)
+    play_random_game(ai_game, 3000, seed=2)
+    data = savegame.save_game(ai_game)
+
+    # A game loaded from the save goes on exactly like the one that was saved.
+    loaded = make_game(seed=4)
+    savegame.load_game(loaded, data)
+    assert_same_state(loaded.get_state(), ai_game.get_state())
+    assert savegame.save_game(loaded) == data
+
+    assert_same_state(play_random_game(loaded, 2000, seed=9),
+                      play_random_game(ai_game, 2000, seed=9))
+
+
+def test_savegame_round_trip_with_waves(make_game, tmp_path):
+    waves = {"wave_file": "waves.json",
+             "wave_cache_file": str(tmp_path / "wave_cache.bin")}
+    ai_game = make_game(seed=6, **waves)
+    play_random_game(ai_game, 3000, seed=1)
+    data = savegame.save_game(ai_game)
+
+    loaded = make_game(seed=6, **waves)
+    savegame.load_game(loaded, data)
+    assert savegame.save_game(loaded) == data
+    assert loaded.settings.alien_speed == ai_game.settings.alien_speed
+
+
+@pytest.mark.parametrize("length", [0, 6, 60, -100, -1])
+def test_damaged_savegame_leaves_the_game_alone(make_game, length):
+    ai_game = make_game(seed=4)
+    play_random_game(ai_game, 500, seed=2)
+    data = savegame.save_game(ai_game)
+
+    other = make_game(seed=5)
+    play_random_game(other, 300, seed=8)
+    before = savegame.save_game(other)
+    with pytest.raises(ValueError):
+        savegame.load_game(other, data[:length])
+    assert savegame.save_game(other) == before
@@ -0,0 +1,44 @@
+import pytest
+
+from waves import load_waves, parse_waves
+
+
+def test_damaged_cache_is_made_again(tmp_path):
+    cache = tmp_path / "wave_cache.bin"
+    waves = load_waves("waves.json", str(cache))
+    data = cache.read_bytes()
+
+    for length in (10, 50, 60, len(data) - 3):
+        cache.write_bytes(data[:length])
+        assert len(load_waves("waves.json", str(cache))) == len(waves)
+        assert cache.read_bytes() == data
+
+
+def test_cache_gives_the_same_levels_as_the_file(tmp_path):
+    cache = str(tmp_path / "wave_cache.bin")
+    parsed = load_waves("waves.json", cache)
+    mapped = load_waves("waves.json", cache)
+    for level in range(1, len(parsed) + 2):
+        one, other = parsed.level(level), mapped.level(level)
+        assert one.alien_speed_scale == other.alien_speed_scale
+        assert (one.column == other.column).all()
+        assert (one.row == other.row).all()
+        assert (one.alien_type == other.alien_type).all()
+
+
+def test_levels_below_one_are_rejected(tmp_path):
+    waves = load_waves("waves.json", str(tmp_path / "wave_cache.bin"))
+    with pytest.raises(ValueError):
+        waves.level(0)
+
+
+@pytest.mark.parametrize("source", [
+    "[]",
+    '{"alien_types": {}, "levels": [{"layout": ["a"]}]}',
+    '{"alien_types": {"a": {}}, "levels": [{"layout": ["b"]}]}',
+    '{"alien_types": {"a": {"hit_points": 0}}, "levels": [{"layout": ["a"]}]}',
+    '{"alien_types": {"a": {}}, "levels": [{"layout": ["..."]}]}',
+])
+def test_bad_wave_files_are_rejected(source):
+    with pytest.raises(ValueError):
+        parse_waves(source)
@@ -0,0 +1,29 @@
+from collections import OrderedDict
+
+class TextCache:
+    """A class to remember rendered text, so the same text is rendered once.
+        When the cache is full, the text used least recently is forgotten.
+    """
+
+    def __init__(self, max_size):
+        """Initialise an empty cache holding up to max_size images."""
+        self.max_size = max_size
+
+        # Key: (font, text, colour, background colour). Value: rendered image.
+        self.images = OrderedDict()
+
+    def render(self, font, text, color, bg_color=None):
+        """Return text rendered with font, like font.render(text, True, ...).
+            Every caller gets the same image, so it must not be drawn on.
+        """
+        key = (font, text, color, bg_color)
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+
+        image = font.render(text, True, color, bg_color)
+        self.images[key] = image
+        if len(self.images) > self.max_size:
+            self.images.popitem(last=False)
+        return image
@@ -0,0 +1,271 @@
+# Load waves of aliens for each level from a wave file.
+#  A wave file is JSON, like this:
+#   {
+#     "alien_types": {"a": {"hit_points": 1, "points": 1},
+#                     "B": {"hit_points": 3, "points": 4}},
+#     "levels": [
+#       {"layout": ["BBBBBB", "aaaaaa", "a.aa.a"], "alien_speed_scale": 1.0}
+#     ]
+#   }
+#  Each character of a layout is an alien of that type, or "." for a gap.
+#  Points are multiplied by the level's alien points. Levels past the last one
+#   use the last layout again.
+#  The file is checked and compiled once into a binary cache, keyed by a hash of
+#   the file, and later launches memory-map the cache instead of parsing it.
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+
+from formation import Formation
+
+MAGIC = b"AIWV"
+VERSION = 1
+
+# Header: magic, version, SHA-256 of the wave file, number of alien types
+#  and of levels.
+HEADER = struct.Struct("<4sB32sHI")
+# Alien type: hit points, points.
+ALIEN_TYPE = struct.Struct("<HH")
+# Level: alien speed scale, first alien in the alien table, number of aliens,
+#  columns, rows.
+LEVEL = struct.Struct("<dIIHH")
+# After the levels, the alien table is stored as three arrays:
+#  column (u2), row (u2) and type (u1) of every alien of every level.
+
+# One level of a wave file. column, row and alien_type are arrays.
+Wave = namedtuple("Wave", ["alien_speed_scale", "columns", "rows",
+                           "column", "row", "alien_type"])
+
+
+def parse_waves(source):
+    """Check the wave file text in source, and return it as a dictionary.
+        Raise ValueError describing the first problem found.
+    """
+    try:
+        waves = json.loads(source)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Not a JSON file: {e}") from None
+    if not isinstance(waves, dict):
+        raise ValueError("A wave file must hold a JSON object.")
+
+    alien_types = waves.get("alien_types")
+    if not isinstance(alien_types, dict) or not alien_types:
+        raise ValueError("'alien_types' must be an object with at least one type.")
+    if len(alien_types) > 255:
+        raise ValueError("There can be at most 255 alien types.")
+    for name, alien_type in alien_types.items():
+        if len(name) != 1 or name == "." or name.isspace():
+            raise ValueError(f"Alien type {name!r} must be one character, not '.'.")
+        if not isinstance(alien_type, dict):
+            raise ValueError(f"Alien type {name!r} must be an object.")
+        for key, lowest in (("hit_points", 1), ("points", 0)):
+            value = alien_type.get(key, 1)
+            if type(value) is not int or not lowest <= value <= 65535:
+                raise ValueError(f"{key} of alien type {name!r} must be a whole "
+                                 f"number from {lowest} to 65535.")
+
+    levels = waves.get("levels")
+    if not isinstance(levels, list) or not levels:
+        raise ValueError("'levels' must be a list with at least one level.")
+    for number, level in enumerate(levels, 1):
+        if not isinstance(level, dict):
+            raise ValueError(f"Level {number} must be an object.")
+        layout = level.get("layout")
+        if (not isinstance(layout, list) or not layout
+                or not all(isinstance(row, str) for row in layout)):
+            raise ValueError(f"The layout of level {number} must be a list of strings.")
+        if len(layout) > 65535 or max(len(row) for row in layout) > 65535:
+            raise ValueError(f"The layout of level {number} is too big.")
+        for row in layout:
+            for character in row:
+                if character != "." and character not in alien_types:
+                    raise ValueError(f"Level {number} uses unknown alien type "
+                                     f"{character!r}.")
+        if all(character == "." for row in layout for character in row):
+            raise ValueError(f"Level {number} has no aliens.")
+        scale = level.get("alien_speed_scale", 1.0)
+        if type(scale) not in (int, float) or not scale > 0:
+            raise ValueError(f"alien_speed_scale of level {number} must be "
+                             f"a number above 0.")
+
+    return waves
+
+
+def compile_waves(waves, digest):
+    """Return the checked waves as the bytes of a wave cache.
+        digest is the SHA-256 of the wave file they came from.
+    """
+    names = list(waves["alien_types"])
+    parts = [HEADER.pack(MAGIC, VERSION, digest, len(names), len(waves["levels"]))]
+    for alien_type in waves["alien_types"].values():
+        parts.append(ALIEN_TYPE.pack(alien_type.get("hit_points", 1),
+                                     alien_type.get("points", 1)))
+
+    # Every alien of every level, in one table.
+    columns, rows, types = [], [], []
+    for level in waves["levels"]:
+        first_alien = len(columns)
+        layout = level["layout"]
+        for row_number, row in enumerate(layout):
+            for column_number, character in enumerate(row):
+                if character != ".":
+                    columns.append(column_number)
+                    rows.append(row_number)
+                    types.append(names.index(character))
+        parts.append(LEVEL.pack(float(level.get("alien_speed_scale", 1.0)),
+                                first_alien, len(columns) - first_alien,
+                                max(len(row) for row in layout), len(layout)))
+
+    parts += [np.array(columns, dtype="<u2").tobytes(),
+              np.array(rows, dtype="<u2").tobytes(),
+              np.array(types, dtype="u1").tobytes()]
+    return b"".join(parts)
+
+
+def load_waves(filepath, cache_filepath):
+    """Return the Waves in the wave file at filepath.
+        The compiled cache at cache_filepath is used if it was made from the
+         same file, and is made again if not.
+    """
+    with open(filepath, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source).digest()
+
+    try:
+        return Waves(_map_cache(cache_filepath, digest))
+    except (OSError, ValueError, struct.error):
+        # Make the cache again if it is missing, out of date or damaged.
+        pass
+
+    data = compile_waves(parse_waves(source), digest)
+    try:
+        _write_cache(cache_filepath, data)
+    except OSError:
+        # The waves can still be used without a cache.
+        pass
+    return Waves(data)
+
+
+def _map_cache(cache_filepath, digest):
+    """Memory-map the cache at cache_filepath, if it was made from the wave file
+        with SHA-256 digest. Raise ValueError if it wasn't.
+    """
+    with open(cache_filepath, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if (len(data) < HEADER.size
+            or HEADER.unpack_from(data)[:3] != (MAGIC, VERSION, digest)):
+        data.close()
+        raise ValueError("The wave cache is out of date.")
+    return data
+
+
+def _write_cache(cache_filepath, data):
+    """Write data to a temporary file, then swap it in as the cache,
+        so a half-written cache is never read.
+    """
+    cache_filepath = os.path.abspath(cache_filepath)
+    file_descriptor, temp_filepath = tempfile.mkstemp(
+        dir=os.path.dirname(cache_filepath), prefix=".wave_cache_")
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(data)
+        os.replace(temp_filepath, cache_filepath)
+    except OSError:
+        os.remove(temp_filepath)
+        raise
+
+
+class Waves:
+    """A class to give the wave of aliens for each level, from a wave cache.
+        The alien table is read straight from the cache's bytes, without copying.
+    """
+
+    def __init__(self, data):
+        """Read the alien types and levels from data, the bytes of a wave cache.
+            Raise ValueError if data is not as long as its header says.
+        """
+        self.data = data
+        # SHA-256 of the wave file the cache was made from.
+        _, _, self.digest, number_types, number_levels = HEADER.unpack_from(data)
+        offset = HEADER.size
+        if len(data) < (offset + number_types * ALIEN_TYPE.size
+                        + number_levels * LEVEL.size):
+            raise ValueError("The wave cache is cut short.")
+
+        types = list(ALIEN_TYPE.iter_unpack(
+            data[offset:offset + number_types * ALIEN_TYPE.size]))
+        offset += number_types * ALIEN_TYPE.size
+        # Hit points and points of each alien type.
+        self.type_hit_points = np.array([hit_points for hit_points, _ in types])
+        self.type_points = np.array([points for _, points in types])
+
+        self.levels = list(LEVEL.iter_unpack(
+            data[offset:offset + number_levels * LEVEL.size]))
+        offset += number_levels * LEVEL.size
+
+        number_aliens = sum(level[2] for level in self.levels)
+        # Each alien has a column and a row (u2), and a type (u1).
+        if len(data) != offset + 5 * number_aliens:
+            raise ValueError("The wave cache is the wrong length.")
+        self.column = np.frombuffer(data, "<u2", number_aliens, offset)
+        offset += 2 * number_aliens
+        self.row = np.frombuffer(data, "<u2", number_aliens, offset)
+        offset += 2 * number_aliens
+        self.alien_type = np.frombuffer(data, "u1", number_aliens, offset)
+
+        # Key: level and sizes. Value: the formation for them.
+        self.formations = {}
+
+    def __len__(self):
+        """Return the number of levels in the wave file."""
+        return len(self.levels)
+
+    def level(self, level):
+        """Return the Wave for level. Levels past the last use the last wave.
+            Raise ValueError if level is below 1.
+        """
+        if level < 1:
+            raise ValueError(f"Levels start at 1, not {level}.")
+        (alien_speed_scale, first_alien, number_aliens, columns,
+         rows) = self.levels[min(level, len(self.levels)) - 1]
+        aliens = slice(first_alien, first_alien + number_aliens)
+        return Wave(alien_speed_scale, columns, rows, self.column[aliens],
+                    self.row[aliens], self.alien_type[aliens])
+
+    def formation(self, level, screen_width, screen_height, alien_width,
+                  alien_height, ship_height):
+        """Return the formation of level on a screen of the given size.
+            Aliens are spaced like the standard grid, and the wave is centred.
+             Columns and rows that don't fit on the screen are left out.
+            Each formation is only worked out once.
+        """
+        key = (min(level, len(self.levels)), screen_width, screen_height,
+               alien_width, alien_height, ship_height)
+        formation = self.formations.get(key)
+        if formation is not None:
+            return formation
+
+        wave = self.level(level)
+        fit_columns = (screen_width - alien_width) // (2 * alien_width)
+        fit_rows = max(0, (screen_height - (5 * alien_height) - ship_height)
+                       // (2 * alien_height))
+        shift = max(0, (fit_columns - wave.columns) // 2)
+
+        fits = (wave.column + shift < fit_columns) & (wave.row < fit_rows)
+        columns = wave.column[fits].astype(int) + shift
+        rows = wave.row[fits].astype(int)
+        types = wave.alien_type[fits]
+        formation = Formation(alien_width + 2 * alien_width * columns,
+                              2 * alien_height + 2 * alien_height * rows,
+                              alien_width, alien_height,
+                              hit_points=self.type_hit_points[types],
+                              points=self.type_points[types])
+        self.formations[key] = formation
+        return formation